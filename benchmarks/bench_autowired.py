@@ -0,0 +1,49 @@
+"""Per-call overhead of the synchronous `@autowired` decorator.
+
+Compares a direct call, a `functools.partial` with the dependency prebound and
+an `@autowired` function.
+
+Usage::
+
+    python -m benchmarks.bench_autowired
+"""
+
+import functools
+import timeit
+
+from di import BasicContainer, autowired
+
+NUMBER = 200_000
+
+
+class Service:
+    pass
+
+
+def handler(value: int, *, service: Service) -> int:
+    del service
+    return value
+
+
+def main() -> None:
+    container = BasicContainer()
+    container += Service
+    service = container.get_component(Service)
+
+    partial = functools.partial(handler, service=service)
+    wired = autowired(container=container)(handler)
+    wired(0)
+
+    cases = {
+        "direct": lambda: handler(1, service=service),
+        "functools.partial": lambda: partial(1),
+        "autowired": lambda: wired(1),
+        "autowired override": lambda: wired(1, service=service),
+    }
+    for name, fn in cases.items():
+        seconds = min(timeit.repeat(fn, number=NUMBER, repeat=5))
+        print(f"{name:>20}: {seconds / NUMBER * 1e9:8.1f} ns/call")
+
+
+if __name__ == "__main__":
+    main()
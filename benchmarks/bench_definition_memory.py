@@ -0,0 +1,67 @@
+"""Memory used per registered component.
+
+The component classes and factories are created before measuring, so the
+numbers cover the definitions and the container bookkeeping only.  Factories all
+return the same plugin type, as in plugin-heavy containers.
+
+Usage::
+
+    python -m benchmarks.bench_definition_memory
+"""
+
+import gc
+import tracemalloc
+from collections.abc import Callable
+from typing import Any
+
+from di import BasicContainer
+from di.aio import AioContainer
+
+SIZES = (10_000, 100_000)
+
+
+class Plugin:
+    pass
+
+
+def make_types(size: int) -> list[type]:
+    return [type(f"Plugin{i}", (Plugin,), {}) for i in range(size)]
+
+
+def make_factories(size: int) -> list[Callable[[], Plugin]]:
+    def make_factory() -> Callable[[], Plugin]:
+        def factory() -> Plugin:
+            return Plugin()
+
+        return factory
+
+    return [make_factory() for _ in range(size)]
+
+
+def bytes_per_component(container_type: type, components: list[Any]) -> float:
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    container = container_type()
+    for component in components:
+        container += component
+    used = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    del container
+    return used / len(components)
+
+
+def main() -> None:
+    shapes = {"types": make_types, "factories": make_factories}
+    for size in SIZES:
+        for shape, make in shapes.items():
+            for container_type in (BasicContainer, AioContainer):
+                used = bytes_per_component(container_type, make(size))
+                print(
+                    f"{size:>7} {shape:<9} {container_type.__name__:<14}"
+                    f" {used:7.0f} bytes/component"
+                )
+
+
+if __name__ == "__main__":
+    main()
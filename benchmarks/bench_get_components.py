@@ -0,0 +1,48 @@
+"""Latency of `BasicContainer.get_components` as the container grows.
+
+The singletons are indexed by the types they satisfy, so the lookup should take
+the same time whatever the number of components in the container.
+
+Usage::
+
+    python -m benchmarks.bench_get_components
+"""
+
+import timeit
+
+from di import BasicContainer
+
+from .graph import make_component_types
+
+SIZES = (10, 100, 1_000, 10_000)
+LOOKUPS = 10_000
+
+
+class Plugin:
+    pass
+
+
+class FirstPlugin(Plugin):
+    pass
+
+
+class SecondPlugin(Plugin):
+    pass
+
+
+def main() -> None:
+    for size in SIZES:
+        container = BasicContainer()
+        for component_type in make_component_types(size):
+            container += component_type
+        container += FirstPlugin
+        container += SecondPlugin
+        container.get_components(Plugin)
+        seconds = timeit.timeit(
+            lambda c=container: c.get_components(Plugin), number=LOOKUPS
+        )
+        print(f"{size:>6} components: {seconds / LOOKUPS * 1e9:8.1f} ns/lookup")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+"""Registration time with and without the metadata cache.
+
+A module with generated component classes is written to a temporary directory
+and registered without the cache, with an empty cache and with a warm cache.
+
+Usage::
+
+    python -m benchmarks.bench_metadata_cache
+"""
+
+import importlib
+import pathlib
+import sys
+import tempfile
+import time
+
+import di.metadata_cache
+from di.aio import AioContainer
+
+SIZE = 3_000
+
+
+def write_module(directory: pathlib.Path) -> None:
+    lines = ["class Base:", "    pass", ""]
+    for i in range(SIZE):
+        deps = ", ".join(f"dep{j}: Component{j}" for j in range(max(0, i - 3), i))
+        lines += [
+            f"class Component{i}(Base):",
+            f"    def __init__(self, *, {deps}):"
+            if deps
+            else "    def __init__(self):",
+            "        pass",
+            "",
+        ]
+    (directory / "generated_components.py").write_text("\n".join(lines))
+
+
+def register() -> float:
+    sys.modules.pop("generated_components", None)
+    module = importlib.import_module("generated_components")
+    types = [getattr(module, f"Component{i}") for i in range(SIZE)]
+    container = AioContainer()
+    start = time.perf_counter()
+    for component_type in types:
+        container += component_type
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    with tempfile.TemporaryDirectory() as directory:
+        path = pathlib.Path(directory)
+        write_module(path)
+        sys.path.insert(0, directory)
+        cache_file = path / "cache.json"
+
+        runs = {"no cache": register()}
+        di.metadata_cache.enable(cache_file)
+        runs["cold cache"] = register()
+        di.metadata_cache.disable()
+        di.metadata_cache.enable(cache_file)
+        runs["warm cache"] = register()
+        di.metadata_cache.disable()
+
+        for name, seconds in runs.items():
+            print(f"{name:>10}: {seconds * 1e3:7.1f} ms for {SIZE} components")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,39 @@
+"""Scaling of the asyncio resolver with the number of definitions.
+
+The time per definition should stay roughly flat as the graph grows.
+
+Usage::
+
+    python -m benchmarks.bench_resolution_scaling
+"""
+
+import asyncio
+import time
+
+from di.aio import AioContainer
+
+from .graph import make_component_types
+
+SIZES = (100, 1_000, 5_000, 20_000)
+
+
+async def resolve_graph(size: int) -> float:
+    container = AioContainer()
+    for component_type in make_component_types(size):
+        container += component_type
+    start = time.perf_counter()
+    await container.get_components(object)
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    for size in SIZES:
+        seconds = asyncio.run(resolve_graph(size))
+        print(
+            f"{size:>7} definitions: {seconds * 1e3:9.1f} ms"
+            f" {seconds / size * 1e6:7.1f} us/definition"
+        )
+
+
+if __name__ == "__main__":
+    main()
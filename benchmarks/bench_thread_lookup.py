@@ -0,0 +1,57 @@
+"""Lookup throughput of a resolved BasicContainer across threads.
+
+Lookups of resolved components do not take a lock, so throughput should scale
+with the threads on a free-threaded CPython build and stay flat with the GIL.
+
+Usage::
+
+    python -m benchmarks.bench_thread_lookup
+"""
+
+import sys
+import threading
+import time
+
+from di import BasicContainer
+
+from .graph import make_component_types
+
+THREADS = (1, 2, 4, 8, 16, 32)
+LOOKUPS = 200_000
+
+
+def run(container: BasicContainer, component_types: list[type], threads: int) -> float:
+    """Lookups per second with the given number of threads."""
+    per_thread = LOOKUPS // threads
+    barrier = threading.Barrier(threads + 1)
+
+    def lookup() -> None:
+        barrier.wait()
+        for i in range(per_thread):
+            container.get_component(component_types[i % len(component_types)])
+
+    workers = [threading.Thread(target=lookup) for _ in range(threads)]
+    for worker in workers:
+        worker.start()
+    barrier.wait()
+    start = time.perf_counter()
+    for worker in workers:
+        worker.join()
+    return per_thread * threads / (time.perf_counter() - start)
+
+
+def main() -> None:
+    gil_enabled = getattr(sys, "_is_gil_enabled", lambda: True)()
+    print(f"Python {sys.version.split()[0]}, GIL {'on' if gil_enabled else 'off'}")
+    component_types = make_component_types(100)
+    container = BasicContainer()
+    for component_type in component_types:
+        container += component_type
+    container.get_component(component_types[0])
+    for threads in THREADS:
+        rate = run(container, component_types, threads)
+        print(f"{threads:>3} threads: {rate / 1e6:6.2f} M lookups/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,39 @@
+"""Compare two result files written by `benchmarks.run`.
+
+Usage::
+
+    python -m benchmarks.compare before.json after.json
+"""
+
+import argparse
+import json
+from typing import Any
+
+
+def key(result: dict[str, Any]) -> tuple:
+    return (result["container"], *sorted(result["spec"].items()))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=(__doc__ or "").splitlines()[0])
+    parser.add_argument("before")
+    parser.add_argument("after")
+    args = parser.parse_args()
+
+    with open(args.before, encoding="utf-8") as f:  # noqa: PTH123
+        before = {key(r): r for r in json.load(f)["results"]}
+    with open(args.after, encoding="utf-8") as f:  # noqa: PTH123
+        after = {key(r): r for r in json.load(f)["results"]}
+
+    for k in sorted(before.keys() & after.keys()):
+        old, new = before[k], after[k]
+        spec = ", ".join(f"{name}={value}" for name, value in k[1:])
+        print(f"{k[0]} {spec}")
+        for metric, value in old.items():
+            if metric in ("container", "spec") or not value:
+                continue
+            print(f"  {metric:>24}: {new[metric] / value:6.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,142 @@
+"""Synthetic component graphs for the benchmarks."""
+
+import dataclasses
+import inspect
+import random
+from collections.abc import Callable
+from typing import Any
+
+
+class Base:
+    """Base type satisfied by every generated component."""
+
+    deps: dict[str, object]
+
+
+def make_component_types(size: int, *, fan_out: int = 3, seed: int = 0) -> list[type]:
+    """Generate component classes that depend on earlier generated classes.
+
+    :param size: number of classes to generate
+    :param fan_out: maximum number of dependencies per class
+    :param seed: seed for the random dependency choice
+    :return: the classes in registration order
+    """
+    rng = random.Random(seed)
+    types: list[type] = []
+    for i in range(size):
+        deps = rng.sample(types, min(fan_out, len(types)))
+        types.append(_make_type(f"Component{i}", deps))
+    return types
+
+
+@dataclasses.dataclass(frozen=True)
+class GraphSpec:
+    """Shape of a generated graph."""
+
+    size: int
+    """Number of components."""
+
+    depth: int = 5
+    """Number of layers, components only depend on the previous layer."""
+
+    fan_out: int = 3
+    """Maximum number of dependencies per component."""
+
+    async_share: float = 0.0
+    """Share of the components built by an async factory."""
+
+    collection_share: float = 0.0
+    """Share of the components taking a `list[T]` of the previous layer."""
+
+    seed: int = 0
+    """Seed for the random choices."""
+
+
+@dataclasses.dataclass(frozen=True)
+class Graph:
+    """Generated components in registration order."""
+
+    spec: GraphSpec
+
+    component_types: list[type]
+    """The component classes."""
+
+    registrations: list[Callable[..., Any]]
+    """Class or factory to register for each component."""
+
+    roots: list[type]
+    """Components of the last layer which nothing depends on."""
+
+
+def make_graph(spec: GraphSpec) -> Graph:
+    """Generate a layered graph.
+
+    Each layer has its own marker base class so collection parameters only take
+    the components of the previous layer.
+    """
+    rng = random.Random(spec.seed)
+    depth = max(1, min(spec.depth, spec.size))
+    markers = [type(f"Layer{layer}", (Base,), {}) for layer in range(depth)]
+    layers: list[list[type]] = [[] for _ in range(depth)]
+    component_types: list[type] = []
+    registrations: list[Callable[..., Any]] = []
+    for i in range(spec.size):
+        layer = i * depth // spec.size
+        previous = layers[layer - 1] if layer else []
+        params: dict[str, Any] = {
+            f"dep{n}": dep
+            for n, dep in enumerate(
+                rng.sample(previous, min(spec.fan_out, len(previous)))
+            )
+        }
+        if previous and rng.random() < spec.collection_share:
+            params["items"] = list[markers[layer - 1]]
+        component_type = _make_type(f"Component{i}", params, base=markers[layer])
+        layers[layer].append(component_type)
+        component_types.append(component_type)
+        if rng.random() < spec.async_share:
+            registrations.append(_make_async_factory(component_type, params))
+        else:
+            registrations.append(component_type)
+    return Graph(
+        spec=spec,
+        component_types=component_types,
+        registrations=registrations,
+        roots=layers[-1],
+    )
+
+
+def _make_type(
+    name: str, deps: list[type] | dict[str, Any], *, base: type = Base
+) -> type:
+    def __init__(self: Base, **kwargs: object) -> None:  # noqa: N807
+        self.deps = kwargs
+
+    if not isinstance(deps, dict):
+        deps = {f"dep{i}": dep for i, dep in enumerate(deps)}
+    parameters = [inspect.Parameter("self", inspect.Parameter.POSITIONAL_OR_KEYWORD)]
+    parameters += [
+        inspect.Parameter(name, inspect.Parameter.KEYWORD_ONLY, annotation=dep)
+        for name, dep in deps.items()
+    ]
+    __init__.__signature__ = inspect.Signature(parameters)  # type: ignore[attr-defined]
+    __init__.__annotations__ = dict(deps)
+    return type(name, (base,), {"__init__": __init__})
+
+
+def _make_async_factory(
+    component_type: type, deps: dict[str, Any]
+) -> Callable[..., Any]:
+    async def factory(**kwargs: object) -> object:
+        return component_type(**kwargs)
+
+    factory.__signature__ = inspect.Signature(  # type: ignore[attr-defined]
+        [
+            inspect.Parameter(name, inspect.Parameter.KEYWORD_ONLY, annotation=dep)
+            for name, dep in deps.items()
+        ],
+        return_annotation=component_type,
+    )
+    factory.__annotations__ = {**deps, "return": component_type}
+    factory.__name__ = factory.__qualname__ = f"make_{component_type.__name__}"
+    return factory
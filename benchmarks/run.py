@@ -0,0 +1,209 @@
+"""Registration, resolution and injection benchmarks for both containers.
+
+Every graph shape is measured for the `AioContainer` and, when the shape only
+uses features it supports, for the `BasicContainer`.  The results are written
+as JSON so runs can be compared with `benchmarks.compare`.
+
+Usage::
+
+    python -m benchmarks.run --output before.json
+    python -m benchmarks.run --size 100 --size 5000 --output after.json
+"""
+
+import argparse
+import asyncio
+import dataclasses
+import json
+import platform
+import sys
+import time
+from collections.abc import Callable
+from typing import Any
+
+from di import BasicContainer
+from di import autowired as basic_autowired
+from di.aio import AioContainer
+from di.aio import autowired as aio_autowired
+
+from .graph import Graph, GraphSpec, make_graph
+
+LOOKUPS = 20_000
+CALLS = 20_000
+BATCHES = 5
+
+
+def default_specs(sizes: list[int]) -> list[GraphSpec]:
+    """Graph shapes measured for each size."""
+    specs = []
+    for size in sizes:
+        specs += [
+            GraphSpec(size),
+            GraphSpec(size, depth=20, fan_out=6),
+            GraphSpec(size, async_share=0.5),
+            GraphSpec(size, collection_share=0.3),
+        ]
+    return specs
+
+
+def basic_supports(spec: GraphSpec) -> bool:
+    """The basic container has no async factories."""
+    return spec.async_share == 0
+
+
+def bench_basic(graph: Graph) -> dict[str, float]:
+    start = time.perf_counter()
+    container = BasicContainer()
+    for registration in graph.registrations:
+        container += registration
+    registered = time.perf_counter()
+    container.get_component(graph.roots[0])
+    resolved = time.perf_counter()
+
+    types = graph.component_types
+    lookup_start = time.perf_counter()
+    for i in range(LOOKUPS):
+        container.get_component(types[i % len(types)])
+    lookup_seconds = time.perf_counter() - lookup_start
+
+    deps = _injected(graph)
+
+    def direct(**kwargs: object) -> None:
+        del kwargs
+
+    wired = basic_autowired(container=container)(_handler(deps, is_async=False))
+    wired()
+    values = {name: container.get_component(t) for name, t in deps.items()}
+    autowired_call = _time_calls(wired)
+    direct_call = _time_calls(direct, values)
+    return {
+        "registration_s": registered - start,
+        "first_resolution_s": resolved - registered,
+        "get_component_ns": lookup_seconds / LOOKUPS * 1e9,
+        "direct_call_ns": direct_call * 1e9,
+        "autowired_call_ns": autowired_call * 1e9,
+    }
+
+
+async def bench_aio(graph: Graph) -> dict[str, float]:
+    start = time.perf_counter()
+    container = AioContainer()
+    for registration in graph.registrations:
+        container += registration
+    registered = time.perf_counter()
+    await container.get_component(graph.roots[0])
+    resolved = time.perf_counter()
+
+    types = graph.component_types
+    lookup_start = time.perf_counter()
+    for i in range(LOOKUPS):
+        await container.get_component(types[i % len(types)])
+    lookup_seconds = time.perf_counter() - lookup_start
+
+    deps = _injected(graph)
+
+    async def direct(**kwargs: object) -> None:
+        del kwargs
+
+    wired = aio_autowired(container=container)(_handler(deps, is_async=True))
+    await wired()
+    values = {name: await container.get_component(t) for name, t in deps.items()}
+    autowired_call = await _time_async_calls(wired)
+    direct_call = await _time_async_calls(direct, values)
+    return {
+        "registration_s": registered - start,
+        "first_resolution_s": resolved - registered,
+        "get_component_ns": lookup_seconds / LOOKUPS * 1e9,
+        "direct_call_ns": direct_call * 1e9,
+        "autowired_call_ns": autowired_call * 1e9,
+    }
+
+
+def _injected(graph: Graph) -> dict[str, type]:
+    """Three parameters injected by the autowired benchmarks."""
+    return {f"dep{i}": t for i, t in enumerate(graph.roots[:3])}
+
+
+def _handler(deps: dict[str, type], *, is_async: bool) -> Callable[..., Any]:
+    """A function with a keyword-only parameter for each dependency."""
+    namespace: dict[str, Any] = {}
+    params = ", ".join(f"{name}: T{i}" for i, name in enumerate(deps))
+    source = (
+        f"{'async def' if is_async else 'def'} handler(*, {params}):\n    return None\n"
+    )
+    exec(  # noqa: S102
+        source, {f"T{i}": t for i, t in enumerate(deps.values())}, namespace
+    )
+    return namespace["handler"]
+
+
+def _time_calls(
+    fn: Callable[..., Any], kwargs: dict[str, object] | None = None
+) -> float:
+    """Seconds per call, best of the batches."""
+    kwargs = kwargs or {}
+    best = float("inf")
+    for _ in range(BATCHES):
+        start = time.perf_counter()
+        for _ in range(CALLS):
+            fn(**kwargs)
+        best = min(best, time.perf_counter() - start)
+    return best / CALLS
+
+
+async def _time_async_calls(
+    fn: Callable[..., Any], kwargs: dict[str, object] | None = None
+) -> float:
+    """Seconds per awaited call, best of the batches."""
+    kwargs = kwargs or {}
+    best = float("inf")
+    for _ in range(BATCHES):
+        start = time.perf_counter()
+        for _ in range(CALLS):
+            await fn(**kwargs)
+        best = min(best, time.perf_counter() - start)
+    return best / CALLS
+
+
+def run(specs: list[GraphSpec], repeat: int) -> list[dict[str, Any]]:
+    """Measure every spec, keeping the best of the repeats for each metric."""
+    results = []
+    for spec in specs:
+        graph = make_graph(spec)
+        containers: dict[str, Callable[[], dict[str, float]]] = {
+            "aio": lambda graph=graph: asyncio.run(bench_aio(graph))
+        }
+        if basic_supports(spec):
+            containers["basic"] = lambda graph=graph: bench_basic(graph)
+        for name, bench in containers.items():
+            runs = [bench() for _ in range(repeat)]
+            metrics = {key: min(r[key] for r in runs) for key in runs[0]}
+            results.append(
+                {"container": name, "spec": dataclasses.asdict(spec), **metrics}
+            )
+            print(name, spec, json.dumps(metrics), file=sys.stderr)
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=(__doc__ or "").splitlines()[0])
+    parser.add_argument("--size", type=int, action="append", dest="sizes")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--output", help="JSON file, standard output if not given")
+    args = parser.parse_args()
+
+    document = {
+        "python": sys.version,
+        "implementation": platform.python_implementation(),
+        "platform": platform.platform(),
+        "timestamp": time.time(),
+        "results": run(default_specs(args.sizes or [100, 1_000]), args.repeat),
+    }
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:  # noqa: PTH123
+            json.dump(document, f, indent=2)
+    else:
+        json.dump(document, sys.stdout, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -11,6 +11,8 @@ from .exceptions import (
     CycleDetectedError,
     DuplicateRegistrationError,
 )
+from .lazy import Lazy
+from .named import Named
 
 __all__ = [
     "BasicContainer",
@@ -19,6 +21,8 @@ __all__ = [
     "ContainerError",
     "CycleDetectedError",
     "DuplicateRegistrationError",
+    "Lazy",
+    "Named",
     "autowired",
     "component",
     "default_container",
@@ -14,6 +14,8 @@ from .exceptions import (
     ContainerLockedError,
     DuplicateRegistrationError,
 )
+from .lazy import Lazy
+from .named import Named
 
 __all__ = [
     "AioContainer",
@@ -22,6 +24,8 @@ __all__ = [
     "ContainerError",
     "ContainerLockedError",
     "DuplicateRegistrationError",
+    "Lazy",
+    "Named",
     "autowired",
     "component",
     "default_aio_container",
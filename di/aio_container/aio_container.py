@@ -1,63 +1,156 @@
+import asyncio
+import contextlib
+import functools
 import inspect
-from collections.abc import Awaitable, Callable
+from collections.abc import AsyncIterator, Awaitable, Callable, Mapping
 from typing import (
     Any,
     ParamSpec,
     Self,
     TypeVar,
+    get_args,
+    get_origin,
 )
 
+import di.fork
 from di.exceptions import (
     ComponentNotFoundError,
     ContainerError,
     ContainerLockedError,
     DuplicateRegistrationError,
 )
+from di.lazy import Lazy, lazy_target
+from di.metadata_cache import cached
+from di.tracing import ConstructionReport, ConstructionTracer
 from di.util import (
     extract_dependencies_from_signature,
     extract_satisfied_types_from_return_of_callable,
     extract_satisfied_types_from_type,
+    keyword_parameters,
 )
 
-from .aio_resolver import resolve
+from .aio_resolver import Resolver, build_aio_plan
 from .component_definition import ComponentDefinition
 from .container import Container
+from .scope import enter_scope
 
 P = ParamSpec("P")
 T = TypeVar("T")
 
 
 class AioContainer(Container):
-    def __init__(self):
+    def __init__(
+        self,
+        *,
+        concurrent: bool = False,
+        lazy: bool = False,
+        trace: bool = False,
+        parent: "AioContainer | None" = None,
+    ):
+        """Create the container.
+
+        :param concurrent: construct independent components concurrently when the
+         container is resolved
+        :param lazy: only construct the requested components and their dependencies
+         on lookup instead of every component on the first lookup.  Lazy lookups are
+         resolved sequentially.
+        :param trace: record the construction timing of the singletons, see
+         construction_report()
+        :param parent: look up the types none of the definitions provide in this
+         container, see child()
+        """
+        self._parent = parent
+        self._inherited: dict[Any, list] = {}
+        self._concurrent = concurrent
+        self._lazy = lazy
+        self._tracer = ConstructionTracer() if trace else None
+        self._resolver: Resolver | None = None
+        self._resolver_lock = asyncio.Lock()
+        self._resolved_types: set[type] = set()
         self._definitions: list[ComponentDefinition[Any]] = []
         self._type_map: dict[type, list] | None = None
+        self._resolution: asyncio.Task[dict[type, list]] | None = None
+        self._locked: bool = False
+        self._closed: bool = False
         self._registered: set = set()
+        di.fork.register(self)
 
-    def add_component_type(self, component_type: type) -> None:
-        if self._type_map is not None:
+    @property
+    def parent(self) -> "AioContainer | None":
+        """The container the lookups fall through to, None for a root container."""
+        return self._parent
+
+    @property
+    def closed(self) -> bool:
+        """Check if the container is closed, lookups of a closed container fail."""
+        return self._closed
+
+    def child(
+        self,
+        *,
+        concurrent: bool = False,
+        lazy: bool = False,
+        trace: bool = False,
+    ) -> "AioContainer":
+        """Create a container falling through to this one.
+
+        The child only holds its own definitions, which add to or override the
+        components of this container.  Types none of them provide are looked up in
+        this container when they are needed, which locks it, and the singletons
+        found are kept by the child.  Components of this container keep their own
+        dependencies even if the child overrides them.  Closing the child only
+        releases the singletons it constructed.
+
+        :param concurrent: see the container constructor
+        :param lazy: see the container constructor
+        :param trace: see the container constructor
+        """
+        return AioContainer(
+            concurrent=concurrent,
+            lazy=lazy,
+            trace=trace,
+            parent=self,
+        )
+
+    def add_component_type(
+        self, component_type: type, *, per_process: bool = False, deferred: bool = False
+    ) -> None:
+        if self._locked:
             raise ContainerLockedError
         if component_type in self._registered:
             raise DuplicateRegistrationError(type_or_factory=component_type)
         self._registered.add(component_type)
-        deps = extract_dependencies_from_signature(component_type.__init__)
-        satisfied_types = extract_satisfied_types_from_type(component_type)
+        deps, satisfied_types = cached(
+            "aio-type",
+            component_type,
+            lambda: (
+                extract_dependencies_from_signature(component_type.__init__),
+                extract_satisfied_types_from_type(component_type),
+            ),
+        )
         self._definitions.append(
             ComponentDefinition(
                 type=component_type,
                 satisfied_types=satisfied_types,
                 dependencies=deps,
                 implementation=None,
+                per_process=per_process,
+                deferred=deferred,
             )
         )
 
     def add_component_implementation(self, implementation: object) -> None:
-        if self._type_map is not None:
+        if self._locked:
             raise ContainerLockedError
         if implementation in self._registered:
             raise DuplicateRegistrationError(type_or_factory=implementation)
         self._registered.add(implementation)
         component_type = type(implementation)
-        satisfied_types = extract_satisfied_types_from_type(component_type)
+        satisfied_types = cached(
+            "satisfied",
+            component_type,
+            lambda: extract_satisfied_types_from_type(component_type),
+        )
         self._definitions.append(
             ComponentDefinition(
                 type=component_type,
@@ -72,16 +165,29 @@ class AioContainer(Container):
         factory: Callable[P, T] | Callable[P, Awaitable[T]],
         *,
         singleton: bool = True,
+        scoped: bool = False,
+        per_process: bool = False,
+        deferred: bool = False,
     ) -> None:
-        if self._type_map is not None:
+        if self._locked:
             raise ContainerLockedError
+        if scoped and not singleton:
+            msg = f"Scoped factory {factory} cannot build prototypes"
+            raise ContainerError(msg)
+        if scoped and per_process:
+            msg = f"Scoped factory {factory} is already released with its scope"
+            raise ContainerError(msg)
         if factory in self._registered:
             raise DuplicateRegistrationError(type_or_factory=factory)
         self._registered.add(factory)
 
-        deps = extract_dependencies_from_signature(factory)
-        return_type, satisfied_types = extract_satisfied_types_from_return_of_callable(
-            factory
+        deps, (return_type, satisfied_types) = cached(
+            "factory",
+            factory,
+            lambda: (
+                extract_dependencies_from_signature(factory),
+                extract_satisfied_types_from_return_of_callable(factory),
+            ),
         )
 
         self._definitions.append(
@@ -93,6 +199,9 @@ class AioContainer(Container):
                 factory=factory,
                 factory_is_async=inspect.iscoroutinefunction(factory),
                 factory_builds_singleton=singleton,
+                factory_scoped=scoped,
+                per_process=per_process,
+                deferred=deferred,
             )
         )
 
@@ -106,6 +215,23 @@ class AioContainer(Container):
         self.add_component_implementation(other)
         return self
 
+    @contextlib.asynccontextmanager
+    async def scope(self) -> AsyncIterator[None]:
+        """Enter a scope for the scoped components.
+
+        Scoped components are constructed at most once in the scope, including the
+        tasks created inside it, and released in reverse construction order when
+        the scope exits.  Looking up a scoped component outside of a scope raises
+        a ContainerError.
+
+        Usage::
+
+            async with container.scope():
+                await handle_request()
+        """
+        async with enter_scope():
+            yield
+
     async def get_component(self, component_type: type[T]) -> T:
         maybe_component = await self.get_optional_component(component_type)
         if maybe_component is None:
@@ -122,29 +248,207 @@ class AioContainer(Container):
         raise ContainerError(msg)
 
     async def get_components(self, component_type: type[T]) -> list[T]:
-        self._type_map = self._type_map or (await resolve(self._definitions))
-        return self._type_map.get(component_type, [])
+        """Gets all components from the container that satisfy the given type.
+
+        Singletons come from the graph resolved when the container is locked,
+        prototypes are constructed on every call and scoped components come from
+        the current scope.  A new proxy is returned for `Lazy[T]`.
+        """
+        target = lazy_target(component_type)
+        if target is not None:
+            return self._lazy_proxies(target)
+        resolver = self._lock()
+        if self._parent is not None and component_type not in resolver.plan.providers:
+            return await self._inherit_components(component_type)
+        singletons = await self._singletons(component_type)
+        if not resolver.has_prototypes(component_type):
+            return singletons
+        return [*singletons, *(await resolver.prototypes(component_type))]
+
+    async def _singletons(self, component_type: type[T]) -> list[T]:
+        resolver = self._lock()
+        if not self._lazy:
+            type_map = await self._resolved_type_map()
+            if component_type in self._resolved_types or not resolver.defers(
+                component_type
+            ):
+                return type_map.get(component_type, [])
+
+        # deferred components are resolved like in a lazy container
+        if component_type not in self._resolved_types:
+            # serialized so shared dependencies are only constructed once
+            async with self._resolver_lock:
+                await resolver.resolve_type(component_type)
+            self._resolved_types.add(component_type)
+        return resolver.collected.get(component_type, [])
+
+    def _provides(self, component_type: Any) -> bool:  # noqa: ANN401
+        """Check if a definition of this container or of a parent provides the type.
+
+        This locks the container and its parents.
+        """
+        if component_type in self._lock().plan.providers:
+            return True
+        return self._parent is not None and self._parent._provides(component_type)  # noqa: SLF001
+
+    def is_prototype(self, component_type: Any) -> bool:  # noqa: ANN401
+        """Check if lookups of the type construct or scope new instances.
+
+        This is the case for prototypes, scoped components and `Lazy[T]`, this
+        locks the container.
+        """
+        if lazy_target(component_type) is not None:
+            return True
+        if component_type in self._lock().plan.providers:
+            return self._lock().has_prototypes(component_type)
+        return self._parent is not None and self._parent.is_prototype(component_type)
+
+    async def _inherit_components(self, component_type: Any) -> list:  # noqa: ANN401
+        """The components of the type from the parent, singletons are kept."""
+        components = self._inherited.get(component_type)
+        if components is not None:
+            return components
+        parent = self._parent
+        if parent is None:
+            return []
+        components = await parent.get_components(component_type)
+        if not self.is_prototype(component_type):
+            self._inherited[component_type] = components
+        return components
+
+    async def _inherit(self, dependency_type: Any) -> Any:  # noqa: ANN401
+        """The dependency of a definition of this container provided by the parent."""
+        origin = get_origin(dependency_type)
+        if origin in {list, set}:
+            (element_type,) = get_args(dependency_type)
+            return origin(await self._inherit_components(element_type))
+        components = await self._inherit_components(dependency_type)
+        if not components:
+            raise ComponentNotFoundError(component_type=dependency_type)
+        if len(components) > 1:
+            msg = f"Multiple components of type {dependency_type} registered"
+            raise ContainerError(msg)
+        return components[0]
+
+    def _lazy_proxy(self, component_type: type[T]) -> Lazy[T]:
+        return Lazy(
+            component_type,
+            functools.partial(self.get_component, component_type),
+            is_async=True,
+        )
+
+    def _lazy_proxies(self, component_type: type) -> list[Any]:
+        """A new proxy of the type if it is provided, this locks the container."""
+        if not self._provides(component_type):
+            return []
+        return [self._lazy_proxy(component_type)]
+
+    def _lock(self) -> Resolver:
+        """Lock the container, this builds the resolution plan."""
+        if self._closed:
+            msg = "Container is closed"
+            raise ContainerError(msg)
+        self._locked = True
+        if self._resolver is None:
+            parent = self._parent
+            self._resolver = Resolver(
+                self._definitions,
+                build_aio_plan(
+                    self._definitions,
+                    inherited=None if parent is None else parent._provides,  # noqa: SLF001
+                ),
+                tracer=self._tracer,
+                lazy=self._lazy_proxy,
+                inherit=self._inherit,
+            )
+        return self._resolver
+
+    async def _resolved_type_map(self) -> dict[type, list]:
+        """Resolve the graph once and cache it, this locks the container.
+
+        Concurrent callers during the first resolution share a single task.
+        """
+        if self._type_map is not None:
+            return self._type_map
+        resolver = self._lock()
+        if self._resolution is None:
+            self._resolution = asyncio.ensure_future(self._resolve(resolver))
+        return await asyncio.shield(self._resolution)
+
+    async def _resolve(self, resolver: Resolver) -> dict[type, list]:
+        try:
+            type_map = await resolver.resolve_all(concurrent=self._concurrent)
+        except BaseException:
+            # allow a later call to retry the resolution
+            self._resolution = None
+            raise
+        self._type_map = type_map
+        return type_map
+
+    def construction_report(self) -> ConstructionReport:
+        """Timing of the singletons constructed so far.
+
+        :raises ContainerError: if the container was not created with trace=True
+        """
+        if self._tracer is None:
+            msg = "Construction tracing is not enabled"
+            raise ContainerError(msg)
+        return self._tracer.report()
+
+    def after_fork(self) -> None:
+        """Drop the per-process singletons, called in the child after a fork.
+
+        The singletons depending on them are dropped too and everything is
+        constructed again on the next lookup, within the event loop of the child.
+        A resolution in progress in the parent is abandoned.
+        """
+        self._resolver_lock = asyncio.Lock()
+        self._resolution = None
+        self._type_map = None
+        self._resolved_types.clear()
+        self._inherited.clear()
+        if self._resolver is not None:
+            self._resolver.drop_per_process()
+
+    async def aclose(self, *, release_timeout: float | None = None) -> None:
+        """Close the container, releasing the singletons it constructed.
+
+        Components are released with `aclose()`, `close()` or `__aexit__` in
+        reverse dependency order, independent branches concurrently.  Lookups
+        fail once the container is closed.
+
+        :param release_timeout: seconds to wait for the release of each component
+        """
+        self._closed = True
+        self._locked = True
+        resolver = self._resolver
+        if resolver is None:
+            return
+        if self._resolution is not None:
+            # components constructed by a resolution in progress are released too
+            with contextlib.suppress(Exception):
+                await self._resolution
+        self._type_map = None
+        async with self._resolver_lock:
+            await resolver.aclose(release_timeout=release_timeout)
 
     async def resolve_function_dependencies(
         self, fn: Callable[..., Any]
     ) -> dict[str, Any]:
         """
         Resolve dependencies for a function's keyword-only arguments.
-        """
-        sig = inspect.signature(fn)
 
-        param_types: dict[str, type] = {
-            name: param.annotation
-            for name, param in sig.parameters.items()
-            if param.kind == inspect.Parameter.KEYWORD_ONLY
-            and param.annotation != inspect.Parameter.empty
-        }
-
-        resolved = await resolve(self._definitions)
+        The container is locked and the resolved graph is reused, so only
+        prototypes are constructed per call.
+        """
+        return await self.resolve_dependencies(keyword_parameters(fn))
 
+    async def resolve_dependencies(
+        self, param_types: Mapping[str, type]
+    ) -> dict[str, Any]:
         results: dict[str, Any] = {}
         for name, param_type in param_types.items():
-            matches = resolved.get(param_type)
+            matches = await self.get_components(param_type)
             if matches:
                 results[name] = matches[0]
 
@@ -1,10 +1,17 @@
+import asyncio
 import inspect
-from collections.abc import Callable
-from typing import Any, TypeVar, get_args, get_origin
+from collections.abc import Awaitable, Callable, Hashable
+from typing import Any, TypeVar
 
-from di.exceptions import ComponentNotFoundError
+from di.exceptions import ComponentNotFoundError, ContainerError
+from di.lazy import Lazy
+from di.resolution_plan import PlanStep, ResolutionPlan, build_plan
+from di.tracing import ConstructionTracer
+from di.util import parameter_types
 
 from .component_definition import ComponentDefinition
+from .lifecycle import release
+from .scope import Scope, current_scope
 
 T = TypeVar("T")
 A = TypeVar("A")
@@ -12,103 +19,473 @@ A = TypeVar("A")
 
 async def resolve(
     definitions: list[ComponentDefinition[A]],
+    *,
+    concurrent: bool = False,
 ) -> dict[type, list]:
-    collected: dict[type, list] = {}
-    constructed: dict[type, Any] = {}
-    constructed_from_factory: dict[Callable[..., Any], Any] = {}
-    implementation_provided: set = set()
-
-    async def resolve_one(defn: ComponentDefinition[T]) -> T:
-        # short-circuit if there's no factory (i.e., class-only resolution)
-        if defn.type in constructed and defn.factory is None:
-            return constructed[defn.type]
-
-        # Short circuit if the factory already built and is a singleton
-        if defn.factory in constructed_from_factory and defn.factory_builds_singleton:
-            return constructed_from_factory[defn.factory]
-
-        # Short circuit if implementation is already there
-        if defn.implementation in implementation_provided:
-            if not isinstance(defn.implementation, defn.type):
-                msg = "Implementation didn't match type"  # pragma: no cover
-                raise TypeError(msg)  # pragma: no cover
-            return defn.implementation
+    """Resolve all the definitions.
+
+    Prototype definitions are only constructed when another component depends on
+    them and their instances are not part of the returned type map.
+
+    :param definitions: the definitions to resolve
+    :param concurrent: construct independent components concurrently
+    :returns: the components keyed by each type they satisfy
+    """
+    return await Resolver(definitions).resolve_all(concurrent=concurrent)
+
+
+def build_aio_plan(
+    definitions: list[ComponentDefinition[A]],
+    *,
+    inherited: Callable[[Any], bool] | None = None,
+) -> ResolutionPlan[ComponentDefinition[A]]:
+    """Build the resolution plan for asyncio component definitions.
+
+    :param definitions: the definitions to resolve
+    :param inherited: checks if a parent container provides a type
+    """
+    return build_plan(
+        definitions,
+        parameters=_parameters,
+        construction_key=_construction_key,
+        inherited=inherited,
+    )
+
 
-        resolved_args = {}
-        for dep_type in defn.dependencies:
-            origin = get_origin(dep_type)
-            args = get_args(dep_type)
+class Resolver:
+    """Execute the resolution plan of the definitions, keeping the singletons.
+
+    Definitions can be resolved incrementally.  Prototype and scoped definitions
+    are only constructed when they are requested or another component depends on
+    them and their instances are not collected.  Scoped instances are kept in the
+    current scope instead.
+    """
+
+    def __init__(
+        self,
+        definitions: list[ComponentDefinition[A]],
+        plan: ResolutionPlan[ComponentDefinition[A]] | None = None,
+        *,
+        tracer: ConstructionTracer | None = None,
+        lazy: Callable[[Any], Lazy[Any]] | None = None,
+        inherit: Callable[[Any], Awaitable[Any]] | None = None,
+    ):
+        """Create the resolver.
+
+        :param definitions: the definitions to resolve
+        :param plan: the resolution plan, built from the definitions if not given
+        :param tracer: records the construction of each singleton
+        :param lazy: creates the proxy injected into a `Lazy[T]` parameter from `T`,
+         by default the proxy resolves the type with this resolver
+        :param inherit: looks up the dependencies the plan takes from a parent
+         container
+        :raises ContainerError: if a singleton depends on a scoped definition
+        """
+        self._plan = build_aio_plan(definitions) if plan is None else plan
+        self._tracer = tracer
+        self._lazy = lazy or self._lazy_proxy
+        self._inherit = inherit or _no_parent
+        self._scoped = frozenset(
+            index
+            for index, step in enumerate(self._plan.steps)
+            if step.definition.factory_scoped
+        )
+        self._check_scoped_dependencies()
+        self._deferred = frozenset(
+            index
+            for index, step in enumerate(self._plan.steps)
+            if step.definition.deferred and not step.prototype
+        )
+        self.collected: dict[type, list] = {}
+        """The constructed components keyed by each type they satisfy."""
+        self._values: dict[int, Any] = {}
+        self._prototype_steps: dict[Any, tuple[int, ...]] = {}
+        for typ, indices in self._plan.providers.items():
+            prototypes = tuple(i for i in indices if self._plan.steps[i].prototype)
+            if prototypes:
+                self._prototype_steps[typ] = prototypes
+
+    @property
+    def plan(self) -> ResolutionPlan[ComponentDefinition[Any]]:
+        """The resolution plan."""
+        return self._plan
+
+    async def resolve_all(self, *, concurrent: bool = False) -> dict[type, list]:
+        """Resolve all the definitions.
+
+        Deferred definitions are skipped unless another definition depends on them.
+
+        :param concurrent: construct independent components concurrently
+        """
+        self._plan.check_cycles()
+        order = self._plan.order_without(self._deferred)
+        if concurrent:
+            await self._execute_concurrently(order)
+        else:
+            await self._execute(order)
+        return self.collected
 
-            if origin in {list, set} and args:
-                inner_type = args[0]
+    async def resolve_type(self, component_type: type) -> list:
+        """Resolve the definitions satisfying the type and their dependencies."""
+        roots = self._plan.providers.get(component_type, ())
+        await self._execute(self._plan.closure(roots))
+        return self.collected.get(component_type, [])
 
-                # Ensure all inner dependencies are resolved first
-                for d in definitions:
-                    if inner_type in d.satisfied_types or d.type == inner_type:
-                        await resolve_one(d)
+    async def prototypes(self, component_type: type[T]) -> list[T]:
+        """Construct new instances of the prototypes satisfying the type.
 
-                values = collected.get(inner_type, [])
-                resolved_args[dep_type] = (
-                    list(values) if origin is list else set(values)
+        The instances of the scoped definitions satisfying the type are taken from
+        the current scope.
+        """
+        instances = []
+        for index in self._prototype_steps.get(component_type, ()):
+            await self._execute(self._plan.closure([index]))
+            if index in self._scoped:
+                instances.append(await self._scoped_instance(index))
+            else:
+                instances.append(await self._construct(self._plan.steps[index]))
+        return instances
+
+    def defers(self, component_type: type) -> bool:
+        """Check if deferred definitions satisfying the type are not resolved yet."""
+        return bool(self._deferred) and any(
+            index in self._deferred and index not in self._values
+            for index in self._plan.providers.get(component_type, ())
+        )
+
+    def has_prototypes(self, component_type: type) -> bool:
+        """Check if prototypes or scoped definitions satisfy the type."""
+        return component_type in self._prototype_steps
+
+    def drop_per_process(self) -> None:
+        """Forget the per-process singletons and everything depending on them.
+
+        The dropped singletons are not released, they are constructed again when
+        they are needed.
+        """
+        dropped = self._plan.dependents(
+            index
+            for index, step in enumerate(self._plan.steps)
+            if step.definition.per_process
+        )
+        values = self._values
+        self._values = {}
+        self.collected = {}
+        for index, instance in values.items():
+            if index not in dropped:
+                self._store(index, instance)
+
+    async def aclose(self, *, release_timeout: float | None = None) -> None:
+        """Release the constructed singletons, dependents before their dependencies.
+
+        Registered implementations and prototype instances are not released.  Each
+        singleton is released as soon as its dependents are released so independent
+        branches are released concurrently.  Every singleton is released even if
+        one fails, the error of the first failing definition in registration order
+        is raised afterwards.
+
+        :param release_timeout: seconds to wait for the release of each singleton, a
+         singleton that takes longer fails with TimeoutError
+        """
+        values, self._values = self._values, {}
+        self.collected = {}
+        owned = [
+            index
+            for index in sorted(values)
+            if self._plan.steps[index].definition.implementation is None
+        ]
+        dependents: dict[int, list[int]] = {index: [] for index in owned}
+        for index in owned:
+            for dep in self._releasing_dependencies(index):
+                if dep in dependents:
+                    dependents[dep].append(index)
+
+        tasks: dict[int, asyncio.Task[None]] = {}
+
+        async def release_step(index: int) -> None:
+            waiting = [tasks[dependent] for dependent in dependents[index]]
+            if waiting:
+                await asyncio.wait(waiting)
+            async with asyncio.timeout(release_timeout):
+                await release(values[index])
+
+        for index in owned:
+            tasks[index] = asyncio.create_task(release_step(index))
+        results = await asyncio.gather(*tasks.values(), return_exceptions=True)
+        for result in results:
+            if isinstance(result, BaseException):
+                raise result
+
+    def _releasing_dependencies(self, index: int) -> set[int]:
+        """Singletons the step holds, directly or through prototype instances."""
+        dependencies: set[int] = set()
+        pending = list(self._plan.steps[index].dependencies)
+        while pending:
+            dep = pending.pop()
+            if dep in dependencies:
+                continue
+            dependencies.add(dep)
+            if self._plan.steps[dep].prototype:
+                pending.extend(self._plan.steps[dep].dependencies)
+        return dependencies
+
+    def _check_scoped_dependencies(self) -> None:
+        """Singletons would keep the scoped instances alive beyond their scope."""
+        needs_scope: set[int] = set()
+        for index in self._plan.order:
+            step = self._plan.steps[index]
+            scoped_deps = needs_scope.intersection(step.dependencies)
+            if index in self._scoped or (step.prototype and scoped_deps):
+                needs_scope.add(index)
+            elif scoped_deps:
+                scoped_type = self._plan.steps[min(scoped_deps)].definition.type
+                msg = (
+                    f"Singleton {step.definition.type} cannot depend on scoped"
+                    f" {scoped_type}"
                 )
+                raise ContainerError(msg)
+
+    async def _execute(self, indices: tuple[int, ...]) -> None:
+        for index in indices:
+            step = self._plan.steps[index]
+            if step.prototype or index in self._values:
                 continue
+            if self._tracer is None:
+                self._store(index, await self._construct(step))
+            else:
+                self._store(index, await self._construct_traced(step, self._tracer))
+
+    async def _execute_concurrently(self, indices: tuple[int, ...]) -> None:
+        """Execute the steps with a task per step.
+
+        Each step awaits the tasks of its dependencies so independent branches of
+        the graph are constructed concurrently.  A failing step does not cancel the
+        other branches: every task is run to completion, then the error of the
+        first failing definition in registration order is raised.
+        """
+        tasks: dict[int, asyncio.Task[Any]] = {}
+        all_tasks: list[tuple[int, asyncio.Task[Any]]] = []
+
+        def schedule(index: int) -> asyncio.Task[Any]:
+            if index in tasks:
+                return tasks[index]
+            task = asyncio.create_task(run(index))
+            all_tasks.append((index, task))
+            if not self._plan.steps[index].prototype:
+                tasks[index] = task
+            return task
 
-            dep_def = next(
-                (
-                    d
-                    for d in definitions
-                    if dep_type in d.satisfied_types or d.type == dep_type
-                ),
-                None,
+        async def run(index: int) -> object:
+            if index in self._values:
+                return self._values[index]
+            step = self._plan.steps[index]
+            _check_missing(step)
+            tracer = None if step.prototype else self._tracer
+            start = tracer.clock() if tracer is not None else 0.0
+            pending = {dep: schedule(dep) for dep in step.dependencies}
+            values = {dep: await task for dep, task in pending.items()}
+            if tracer is None:
+                return await _call(step, values, self._lazy, self._inherit)
+            ready = tracer.clock()
+            instance = await _call(step, values, self._lazy, self._inherit)
+            tracer.record(
+                step.definition.type,
+                lane=_lane(),
+                start=start,
+                ready=ready,
+                is_async=step.definition.factory_is_async,
             )
-            if not dep_def:
-                raise ComponentNotFoundError(component_type=dep_type)
-
-            dep_instance = await resolve_one(dep_def)
-            resolved_args[dep_type] = dep_instance
-
-        if defn.implementation is not None:
-            implementation_provided.add(defn.implementation)
-            instance = defn.implementation
-        elif defn.factory is not None:
-            factory = defn.factory
-            kwargs = _match_args_by_type(factory, resolved_args)
-            if defn.factory_is_async:
-                if not inspect.iscoroutinefunction(factory):
-                    msg = "factory method was expected to be async"  # pragma: no cover
-                    raise TypeError(msg)  # pragma: no cover
-                instance = await factory(**kwargs)
+            return instance
+
+        try:
+            for index in indices:
+                if not self._plan.steps[index].prototype:
+                    schedule(index)
+            # the running steps schedule their dependencies as they go
+            while running := [task for _, task in all_tasks if not task.done()]:
+                await asyncio.wait(running)
+        except BaseException:
+            for _, task in all_tasks:
+                task.cancel()
+            await asyncio.gather(
+                *(task for _, task in all_tasks), return_exceptions=True
+            )
+            raise
+
+        errors = [task.exception() for _, task in sorted(all_tasks, key=lambda t: t[0])]
+        for error in errors:
+            if error is not None:
+                raise error
+
+        for index in indices:
+            if index in tasks and index not in self._values:
+                self._store(index, tasks[index].result())
+
+    async def _construct(
+        self, step: PlanStep[ComponentDefinition[T]], scope: Scope | None = None
+    ) -> T:
+        """Construct the step with new instances of its prototype dependencies.
+
+        :param scope: the scope of the scoped dependencies, the current scope if
+         not given
+        """
+        _check_missing(step)
+        values = await self._dependency_values(step, scope)
+        return await _call(step, values, self._lazy, self._inherit)
+
+    async def _construct_traced(
+        self, step: PlanStep[ComponentDefinition[T]], tracer: ConstructionTracer
+    ) -> T:
+        """Construct the step, recording its timing."""
+        _check_missing(step)
+        start = tracer.clock()
+        values = await self._dependency_values(step, None)
+        ready = tracer.clock()
+        instance = await _call(step, values, self._lazy, self._inherit)
+        tracer.record(
+            step.definition.type,
+            lane=_lane(),
+            start=start,
+            ready=ready,
+            is_async=step.definition.factory_is_async,
+        )
+        return instance
+
+    async def _dependency_values(
+        self, step: PlanStep[ComponentDefinition[Any]], scope: Scope | None
+    ) -> dict[int, Any]:
+        """Dependencies of the step keyed by step, constructing the prototypes."""
+        values = {}
+        for dep in step.dependencies:
+            dep_step = self._plan.steps[dep]
+            if dep in self._scoped:
+                values[dep] = await self._scoped_instance(dep, scope)
+            elif dep_step.prototype:
+                values[dep] = await self._construct(dep_step, scope)
             else:
-                instance = factory(**kwargs)
+                values[dep] = self._values[dep]
+        return values
 
-            if defn.factory_builds_singleton:
-                constructed_from_factory[defn.factory] = instance
-        else:
-            kwargs = _match_args_by_type(defn.type, resolved_args)
-            instance = defn.type(**kwargs)
-            constructed[defn.type] = instance
+    async def _scoped_instance(self, index: int, scope: Scope | None = None) -> Any:  # noqa: ANN401
+        """Instance of the scoped step, constructed once per scope.
 
-        for typ in defn.satisfied_types:
-            collected.setdefault(typ, []).append(instance)
+        Concurrent lookups of the step await the construction in progress, other
+        scoped components can still be looked up while it runs.
 
-        if not isinstance(instance, defn.type):
-            msg = "Instance had unexpected type"  # pragma: no cover
-            raise TypeError(msg)  # pragma: no cover
+        :param scope: the scope of the instance, the current scope if not given
+        """
+        if scope is None:
+            scope = current_scope()
+        key = (self, index)
+        if key in scope.instances:
+            return scope.instances[key]
+        pending = scope.pending.get(key)
+        if pending is not None:
+            return await asyncio.shield(pending)
+        pending = scope.pending[key] = asyncio.get_running_loop().create_future()
+        try:
+            instance = await self._construct(self._plan.steps[index], scope)
+        except BaseException as e:
+            # allow a later lookup to retry the construction
+            del scope.pending[key]
+            if isinstance(e, asyncio.CancelledError):
+                pending.cancel()
+            else:
+                pending.set_exception(e)
+                # only waiters report the error
+                pending.exception()
+            raise
+        scope.instances[key] = instance
+        del scope.pending[key]
+        pending.set_result(instance)
         return instance
 
-    async def resolve_all() -> None:
-        for defn in definitions:
-            await resolve_one(defn)
+    def _lazy_proxy(self, component_type: type[T]) -> Lazy[T]:
+        async def resolve() -> T:
+            (instance, *_) = [
+                *await self.resolve_type(component_type),
+                *await self.prototypes(component_type),
+            ]
+            return instance
+
+        return Lazy(component_type, resolve, is_async=True)
+
+    def _store(self, index: int, instance: object) -> None:
+        self._values[index] = instance
+        for typ in self._plan.steps[index].definition.satisfied_types:
+            self.collected.setdefault(typ, []).append(instance)
+
+
+async def _no_parent(dependency_type: object) -> Any:  # noqa: ANN401
+    msg = f"{dependency_type} can only be inherited from a parent container"
+    raise ContainerError(msg)
+
+
+def _lane() -> str:
+    task = asyncio.current_task()
+    return "main" if task is None else task.get_name()
+
+
+def _check_missing(step: PlanStep[Any]) -> None:
+    if step.missing:
+        raise ComponentNotFoundError(component_type=step.missing[0])
+
+
+async def _call(
+    step: PlanStep[ComponentDefinition[T]],
+    values: dict[int, Any],
+    lazy: Callable[[Any], Lazy[Any]],
+    inherit: Callable[[Any], Awaitable[Any]],
+) -> T:
+    """Call the factory or constructor of the step with its dependencies."""
+    defn = step.definition
+    if defn.implementation is not None:
+        return defn.implementation
+
+    kwargs = {name: values[dep] for name, dep in step.kwargs.items()}
+    for name, slot in step.collections.items():
+        kwargs[name] = slot.kind(values[dep] for dep in slot.steps)
+    for name, lazy_type in step.lazy.items():
+        kwargs[name] = lazy(lazy_type)
+    for name, dep_type in step.inherited.items():
+        kwargs[name] = await inherit(dep_type)
+
+    if defn.factory is not None:
+        factory = defn.factory
+        if defn.factory_is_async:
+            if not inspect.iscoroutinefunction(factory):
+                msg = "factory method was expected to be async"  # pragma: no cover
+                raise TypeError(msg)  # pragma: no cover
+            instance = await factory(**kwargs)
+        else:
+            instance = factory(**kwargs)
+    else:
+        instance = defn.type(**kwargs)
+
+    if not isinstance(instance, defn.type):
+        msg = "Instance had unexpected type"  # pragma: no cover
+        raise TypeError(msg)  # pragma: no cover
+    return instance
+
 
-    await resolve_all()
-    return collected
+def _parameters(defn: ComponentDefinition[Any]) -> dict[str, Any]:
+    """Match the dependencies of the definition to parameter names by type."""
+    if defn.implementation is not None:
+        return {}
+    fn = defn.factory if defn.factory is not None else defn.type.__init__
+    return {
+        name: key
+        for name, key in parameter_types(fn).items()
+        if key in defn.dependencies
+    }
 
 
-def _match_args_by_type(fn: Callable, resolved_deps: dict[type, Any]) -> dict[str, Any]:
-    """Match resolved dependency values to parameter names by their annotated type."""
-    sig = inspect.signature(fn)
-    matched = {}
-    for name, param in sig.parameters.items():
-        if param.annotation in resolved_deps:
-            matched[name] = resolved_deps[param.annotation]
-    return matched
+def _construction_key(defn: ComponentDefinition[Any]) -> Hashable | None:
+    """Key identifying a single construction, None for prototypes and scoped."""
+    if defn.implementation is not None:
+        return id(defn.implementation)
+    if defn.factory is None:
+        return defn.type
+    if defn.factory_builds_singleton and not defn.factory_scoped:
+        return defn.factory
+    return None
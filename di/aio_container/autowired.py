@@ -8,6 +8,9 @@ from typing import (
     overload,
 )
 
+import di.fork
+from di.util import extract_injectable_parameters
+
 from .container import Container
 from .default_aio_container import default_aio_container
 
@@ -40,7 +43,11 @@ def autowired(
 ):
     """Async-only autowired decorator.
 
-    Injects keyword-only parameters from the container if not provided.
+    Injects keyword-only parameters from the container if not provided.  The
+    components are resolved on the first call, which locks the container, and
+    reused by later calls.  Prototypes and scoped components are looked up again
+    on every call and everything is looked up again in a forked child process or
+    once the container is closed, which raises a ContainerError.
     Raises TypeError if used on a non-async function.
     """
 
@@ -49,24 +56,38 @@ def autowired(
             msg = "The @autowired decorator only supports async functions."
             raise TypeError(msg)
 
-        sig = inspect.signature(f)
+        injectable = extract_injectable_parameters(f)
+        if not injectable:
+            return f
+
+        # The container is locked by the first call so the resolved singletons
+        # are bound once and reused by every later call.
+        bound: dict[str, Any] | None = None
+        prototypes: dict[str, type] = {}
+        generation = di.fork.generation
 
         @functools.wraps(f)
         async def inner(*args: P.args, **kwargs: P.kwargs) -> R:
-            bound_args = sig.bind_partial(*args, **kwargs)
-            bound_args.apply_defaults()
-
-            # Always resolve dependencies fresh for each call
-            resolved = await container.resolve_function_dependencies(f)
-            for name, param in sig.parameters.items():
-                if (
-                    param.kind == inspect.Parameter.KEYWORD_ONLY
-                    and name not in bound_args.arguments
-                    and name in resolved
-                ):
-                    bound_args.arguments[name] = resolved[name]
-
-            return await f(*bound_args.args, **bound_args.kwargs)
+            nonlocal bound, generation
+            if bound is None or generation != di.fork.generation or container.closed:
+                generation = di.fork.generation
+                prototypes.clear()
+                prototypes.update(
+                    (name, param_type)
+                    for name, param_type in injectable.items()
+                    if container.is_prototype(param_type)
+                )
+                bound = await container.resolve_dependencies(
+                    {n: t for n, t in injectable.items() if n not in prototypes}
+                )
+            if prototypes:
+                fresh = await container.resolve_dependencies(
+                    {n: t for n, t in prototypes.items() if n not in kwargs}
+                )
+                return await f(*args, **{**bound, **fresh, **kwargs})
+            if not kwargs:
+                return await f(*args, **bound)
+            return await f(*args, **{**bound, **kwargs})
 
         return inner
 
@@ -1,4 +1,5 @@
-from collections.abc import Awaitable, Callable
+from collections.abc import Awaitable, Callable, Mapping
+from contextlib import AbstractAsyncContextManager
 from typing import (
     ParamSpec,
     Self,
@@ -14,13 +15,21 @@ P = ParamSpec("P")
 class Container(ComponentAddable):
     """asyncio Dependency injection container."""
 
-    def add_component_type(self, component_type: type) -> None:
+    def add_component_type(
+        self,
+        component_type: type,
+        *,
+        per_process: bool = False,
+        deferred: bool = False,
+    ) -> None:
         """Add a component type into the container.
 
         This will throw a ContainerLockedError if an attempt to add was done after the
         first get operation.
 
         :param component_type: A class type to be added as a component.
+        :param per_process: construct the component again in forked children
+        :param deferred: only construct the component when it is needed
         """
         raise NotImplementedError  # pragma: no cover
 
@@ -29,6 +38,9 @@ class Container(ComponentAddable):
         factory: Callable[P, T] | Callable[P, Awaitable[T]],
         *,
         singleton: bool = True,
+        scoped: bool = False,
+        per_process: bool = False,
+        deferred: bool = False,
     ) -> None:
         """Adds a component factory into the container.
 
@@ -40,6 +52,11 @@ class Container(ComponentAddable):
         :param factory: The factory that would construct the object.  The function can
          take additional kwargs which represent dependencies in the container
          :param singleton: Create singleton
+         :param scoped: Create one instance per scope, see scope()
+         :param per_process: construct the component again in forked children
+         :param deferred: only construct the component when it is needed
+        :raises ContainerError: if scoped is combined with singleton=False or
+         per_process=True
         """
         raise NotImplementedError  # pragma: no cover
 
@@ -59,6 +76,10 @@ class Container(ComponentAddable):
         """Add a component type, factory or implementation to the container."""
         return NotImplemented  # pragma: no cover
 
+    def scope(self) -> AbstractAsyncContextManager[None]:
+        """Enter a scope, the scoped components are released when it exits."""
+        raise NotImplementedError  # pragma: no cover
+
     async def get_component(self, component_type: type[T]) -> T:
         """Gets a single component from the container that satisfies the given type.
         This resolves all constructor dependencies for the component.
@@ -90,7 +111,38 @@ class Container(ComponentAddable):
         """
         raise NotImplementedError  # pragma: no cover
 
+    @property
+    def closed(self) -> bool:
+        """Check if the container is closed, lookups of a closed container fail."""
+        raise NotImplementedError  # pragma: no cover
+
+    def is_prototype(self, component_type: type) -> bool:
+        """Check if lookups of the type construct or scope new instances.
+
+        This locks the container.
+        """
+        raise NotImplementedError  # pragma: no cover
+
+    async def aclose(self, *, release_timeout: float | None = None) -> None:
+        """Close the container, releasing the components it constructed.
+
+        :param release_timeout: seconds to wait for the release of each component
+        """
+        raise NotImplementedError  # pragma: no cover
+
     async def resolve_function_dependencies(
         self, fn: Callable[..., object]
     ) -> dict[str, object]:
         raise NotImplementedError  # pragma: no cover
+
+    async def resolve_dependencies(
+        self, param_types: Mapping[str, type]
+    ) -> dict[str, object]:
+        """Resolve a component for each parameter name.
+
+        Parameters whose type is not in the container are left out of the result.
+
+        :param param_types: mapping of parameter name to the type to inject
+        :return: mapping of parameter name to the component
+        """
+        raise NotImplementedError  # pragma: no cover
@@ -33,15 +33,23 @@ R = TypeVar("R")
 def factory(fn: Callable[..., R]) -> Callable[..., R]: ...  # pragma: no cover
 @overload
 def factory(
-    *, container: Container = default_aio_container, singleton: bool = True
+    *,
+    container: Container = default_aio_container,
+    singleton: bool = True,
+    scoped: bool = False,
+    per_process: bool = False,
+    deferred: bool = False,
 ) -> Callable[[Callable[..., R]], Callable[..., R]]: ...  # pragma: no cover
 
 
-def factory(
+def factory(  # noqa: PLR0913
     fn: Callable[..., R] | None = None,
     *,
     container: Container = default_aio_container,
     singleton: bool = True,
+    scoped: bool = False,
+    per_process: bool = False,
+    deferred: bool = False,
 ) -> Callable[..., R] | Callable[[Callable[..., R]], Callable[..., R]]:
     """Function decorator to register a factory with a container.
 
@@ -50,6 +58,20 @@ def factory(
     :param fn: The factory function (sync or async) to register.
     :param container: Optional; the container instance to register the factory in.
     :param singleton: Create singleton
+    :param scoped: Create one instance per scope, see `AioContainer.scope()`,
+     this cannot be combined with singleton=False or per_process=True
+    :param per_process: Create the singleton again in forked child processes
+    :param deferred: Only construct the singleton when it is looked up or needed,
+     even in an eager container
     :return: The original function, or a decorator function.
+    :raises ContainerError: if scoped is combined with singleton=False or
+     per_process=True
     """
-    return register_factory_to_container(fn, container, singleton=singleton)
+    return register_factory_to_container(
+        fn,
+        container,
+        singleton=singleton,
+        scoped=scoped,
+        per_process=per_process,
+        deferred=deferred,
+    )
@@ -0,0 +1,29 @@
+"""Release of the components constructed by the container."""
+
+import inspect
+
+
+async def release(instance: object) -> None:
+    """Release the instance with the first cleanup method it has.
+
+    An `aclose()` coroutine is awaited, otherwise `close()` is called and awaited
+    if it returns an awaitable, otherwise `__aexit__` is awaited without an
+    exception.  Instances without any of these are left as is.
+    """
+    aclose = getattr(instance, "aclose", None)
+    if callable(aclose):
+        result = aclose()
+        if inspect.isawaitable(result):
+            await result
+        return
+    close = getattr(instance, "close", None)
+    if callable(close):
+        result = close()
+        if inspect.isawaitable(result):
+            await result
+        return
+    aexit = getattr(instance, "__aexit__", None)
+    if callable(aexit):
+        result = aexit(None, None, None)
+        if inspect.isawaitable(result):
+            await result
@@ -0,0 +1,76 @@
+"""Scopes holding the instances of scoped components.
+
+The current scope is kept in a context variable so it is shared by the tasks
+created inside it.  Scoped components can only be resolved inside a scope, so
+their instances are always released when the scope exits.
+"""
+
+import contextlib
+import contextvars
+from collections.abc import AsyncIterator, Hashable
+from typing import TYPE_CHECKING
+
+from di.exceptions import ContainerError
+
+from .lifecycle import release
+
+if TYPE_CHECKING:
+    import asyncio
+
+
+class Scope:
+    """Instances of the scoped components constructed within one scope."""
+
+    def __init__(self) -> None:
+        """Create an empty scope."""
+        self.instances: dict[Hashable, object] = {}
+        """The constructed instances in construction order."""
+
+        self.pending: dict[Hashable, asyncio.Future[object]] = {}
+        """Constructions in progress, awaited by concurrent lookups of the same key."""
+
+    async def aclose(self) -> None:
+        """Release the instances in reverse construction order.
+
+        Every instance is released even if one fails, the first error is raised
+        afterwards.
+        """
+        instances = list(self.instances.values())
+        self.instances.clear()
+        error: BaseException | None = None
+        for instance in reversed(instances):
+            try:
+                await release(instance)
+            except Exception as e:  # noqa: BLE001
+                error = error or e
+        if error is not None:
+            raise error
+
+
+_current_scope: contextvars.ContextVar[Scope | None] = contextvars.ContextVar(
+    "di_scope", default=None
+)
+
+
+@contextlib.asynccontextmanager
+async def enter_scope() -> AsyncIterator[Scope]:
+    """Enter a new scope, releasing its instances on exit."""
+    scope = Scope()
+    token = _current_scope.set(scope)
+    try:
+        yield scope
+    finally:
+        _current_scope.reset(token)
+        await scope.aclose()
+
+
+def current_scope() -> Scope:
+    """The scope entered by the caller.
+
+    :raises ContainerError: if no scope is entered
+    """
+    scope = _current_scope.get()
+    if scope is None:
+        msg = "Scoped components can only be resolved within `container.scope()`"
+        raise ContainerError(msg)
+    return scope
@@ -228,3 +228,26 @@ async def test_resolver_with_class_accepting_list_which_can_be_empty():
     resolved = await resolve(definitions=definitions)
     assert isinstance(resolved[MyClassWithList][0], MyClassWithList)
     assert resolved[MyClassWithList][0].dep_count() == 0
+
+
+async def test_resolver_picks_first_registered_provider():
+    definitions = [
+        ComponentDefinition(
+            type=MyDep2,
+            satisfied_types={MyDep2, Proto},
+            dependencies=set(),
+        ),
+        ComponentDefinition(
+            type=MyDep,
+            satisfied_types={MyDep, Proto},
+            dependencies=set(),
+        ),
+        ComponentDefinition(
+            type=MyDepWithDeps,
+            satisfied_types={MyDepWithDeps},
+            dependencies={Proto},
+        ),
+    ]
+    resolved = await resolve(definitions=definitions)
+    assert resolved[MyDepWithDeps][0].blah() == "blah-foo2"
+    assert [type(p) for p in resolved[Proto]] == [MyDep2, MyDep]
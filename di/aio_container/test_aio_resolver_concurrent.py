@@ -0,0 +1,137 @@
+import asyncio
+import time
+import typing
+
+import pytest
+
+from di.aio import ComponentNotFoundError
+from di.exceptions import CycleDetectedError
+
+from .aio_resolver import resolve
+from .component_definition import ComponentDefinition
+
+DELAY = 0.05
+
+
+@typing.runtime_checkable
+class Proto(typing.Protocol):
+    def meth(self) -> str: ...
+
+
+class Database(Proto):
+    def meth(self):
+        return "database"
+
+
+class Cache(Proto):
+    def meth(self):
+        return "cache"
+
+
+class Broker(Proto):
+    def meth(self):
+        return "broker"
+
+
+class App:
+    def __init__(self, *, database: Database, cache: Cache, protos: list[Proto]):
+        self.database = database
+        self.cache = cache
+        self.protos = protos
+
+
+build_count: list[type] = []
+
+
+async def connect_database() -> Database:
+    await asyncio.sleep(DELAY)
+    build_count.append(Database)
+    return Database()
+
+
+async def connect_cache() -> Cache:
+    await asyncio.sleep(DELAY)
+    return Cache()
+
+
+async def connect_broker() -> Broker:
+    await asyncio.sleep(DELAY)
+    msg = "broker unavailable"
+    raise ConnectionError(msg)
+
+
+async def wrap_proto(*, proto: Proto) -> Proto:
+    return proto
+
+
+def definitions_for(*factories: typing.Callable) -> list[ComponentDefinition]:
+    definitions = [
+        ComponentDefinition(
+            type=typing.get_type_hints(f)["return"],
+            satisfied_types={typing.get_type_hints(f)["return"], Proto},
+            dependencies=set(),
+            factory=f,
+            factory_is_async=True,
+        )
+        for f in factories
+    ]
+    definitions.append(
+        ComponentDefinition(
+            type=App,
+            satisfied_types={App},
+            dependencies={Database, Cache, list[Proto]},
+        )
+    )
+    return definitions
+
+
+async def test_independent_factories_run_concurrently():
+    build_count.clear()
+    start = time.perf_counter()
+    resolved = await resolve(
+        definitions_for(connect_database, connect_cache), concurrent=True
+    )
+    elapsed = time.perf_counter() - start
+    assert elapsed < 2 * DELAY
+    app = resolved[App][0]
+    assert app.database is resolved[Database][0]
+    assert [p.meth() for p in app.protos] == ["database", "cache"]
+    assert build_count == [Database]
+
+
+async def test_same_result_as_sequential():
+    sequential = await resolve(definitions_for(connect_database, connect_cache))
+    concurrent = await resolve(
+        definitions_for(connect_database, connect_cache), concurrent=True
+    )
+    assert sequential.keys() == concurrent.keys()
+    for typ, instances in sequential.items():
+        assert [type(i) for i in instances] == [type(i) for i in concurrent[typ]]
+
+
+async def test_failing_branch_raises_its_error():
+    with pytest.raises(ConnectionError):
+        await resolve(
+            definitions_for(connect_database, connect_broker, connect_cache),
+            concurrent=True,
+        )
+
+
+async def test_missing_dependency():
+    definitions = definitions_for(connect_database)
+    with pytest.raises(ComponentNotFoundError):
+        await resolve(definitions, concurrent=True)
+
+
+async def test_cycle_is_detected():
+    definitions = [
+        ComponentDefinition(
+            type=Proto,
+            satisfied_types={Proto},
+            dependencies={Proto},
+            factory=wrap_proto,
+            factory_is_async=True,
+        )
+    ]
+    with pytest.raises(CycleDetectedError):
+        await resolve(definitions, concurrent=True)
@@ -1,7 +1,9 @@
 import functools
-import inspect
-from collections.abc import Callable
-from typing import ParamSpec, TypeVar, overload
+from collections.abc import Callable, Mapping
+from typing import Any, ParamSpec, TypeVar, overload
+
+import di.fork
+from di.util import extract_injectable_parameters
 
 from .container import Container
 from .default_container import default_container
@@ -28,7 +30,10 @@ def autowired(
     """Function decorator for dependency injection.
 
     Automatically injects keyword-only parameters from the container
-    if they are not supplied at call-time.
+    if they are not supplied at call-time.  The components are resolved on the
+    first call, which locks the container, and reused by later calls.  Prototypes
+    are looked up again on every call and everything is looked up again in a
+    forked child process.
 
     Supports usage with or without parentheses:
 
@@ -46,26 +51,55 @@ def autowired(
     """
 
     def wrapper(f: Callable[P, R]) -> Callable[..., R]:
-        sig = inspect.signature(f)
+        injectable = extract_injectable_parameters(f)
+        if not injectable:
+            return f
+
+        # The container is locked by the first lookup so the resolved singletons
+        # are bound once and reused by every later call.
+        bound: dict[str, Any] | None = None
+        prototypes: dict[str, type] = {}
+        generation = di.fork.generation
 
         @functools.wraps(f)
         def inner(*args: P.args, **kwargs: P.kwargs) -> R:
-            bound_args = sig.bind_partial(*args, **kwargs)
-            bound_args.apply_defaults()
-
-            for name, param in sig.parameters.items():
-                if (
-                    param.kind == inspect.Parameter.KEYWORD_ONLY
-                    and name not in bound_args.arguments
-                ) and param.annotation != inspect.Parameter.empty:
-                    dep = container.get_optional_component(param.annotation)
-                    if dep is not None:
-                        bound_args.arguments[name] = dep
-
-            return f(*bound_args.args, **bound_args.kwargs)
+            nonlocal bound, generation
+            if bound is None or generation != di.fork.generation:
+                generation = di.fork.generation
+                prototypes.clear()
+                prototypes.update(
+                    (name, param_type)
+                    for name, param_type in injectable.items()
+                    if container.is_prototype(param_type)
+                )
+                bound = _resolve_injectable(
+                    container,
+                    {n: t for n, t in injectable.items() if n not in prototypes},
+                )
+            if prototypes:
+                fresh = _resolve_injectable(
+                    container,
+                    {n: t for n, t in prototypes.items() if n not in kwargs},
+                )
+                return f(*args, **{**bound, **fresh, **kwargs})
+            if not kwargs:
+                return f(*args, **bound)
+            return f(*args, **{**bound, **kwargs})
 
         return inner
 
     if func is None:
         return wrapper
     return wrapper(func)
+
+
+def _resolve_injectable(
+    container: Container, injectable: Mapping[str, type]
+) -> dict[str, Any]:
+    """Resolve the injectable parameters that are available in the container."""
+    resolved = {}
+    for name, param_type in injectable.items():
+        dep = container.get_optional_component(param_type)
+        if dep is not None:
+            resolved[name] = dep
+    return resolved
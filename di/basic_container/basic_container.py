@@ -1,8 +1,12 @@
+import functools
 import inspect
+import threading
 import typing
-from collections.abc import Callable
+from collections.abc import Callable, Mapping, Sequence
+from types import MappingProxyType
 from typing import Any, ParamSpec, Self, TypeVar
 
+import di.fork
 import di.util
 from di.exceptions import (
     ComponentNotFoundError,
@@ -10,6 +14,9 @@ from di.exceptions import (
     ContainerLockedError,
     DuplicateRegistrationError,
 )
+from di.lazy import Lazy, lazy_target
+from di.metadata_cache import cached
+from di.tracing import ConstructionReport, ConstructionTracer
 from di.util import (
     extract_satisfied_types_from_return_of_callable,
     extract_satisfied_types_from_type,
@@ -24,67 +31,116 @@ T = TypeVar("T")
 
 
 class BasicContainer(Container):
-    """Basic Container that only supports synchronized calls."""
+    """Basic Container that only supports synchronized calls.
 
-    def __init__(self):
+    The container is thread-safe.  Resolution happens under a lock and publishes
+    immutable snapshots of the resolved components, so lookups of resolved types
+    do not take the lock.
+    """
+
+    def __init__(self, *, lazy: bool = False, trace: bool = False):
+        """Create the container.
+
+        :param lazy: only construct the requested components and their dependencies
+         on lookup instead of every component on the first lookup
+        :param trace: record the construction timing of the singletons, see
+         construction_report()
+        """
         self._definitions: list[ComponentDefinition[Any]] = []
-        self._type_map: dict[type, Any] = {}
-        self._instances: set = set()
         self._locked: bool = False
         self._registered: set = set()
+        self._lazy = lazy
+        self._tracer = ConstructionTracer() if trace else None
+        self._resolver: Resolver | None = None
+        self._mutex = threading.RLock()
+
+        # written by the resolver while holding the mutex
+        self._resolved_type_map: dict[type, Any] = {}
+        self._resolved_components: dict[type, tuple[Any, ...]] = {}
 
-    def add_component_type(self, component_type: type[T]) -> None:
+        # published snapshots, replaced while holding the mutex but never mutated
+        self._type_map: Mapping[type, Any] = MappingProxyType({})
+        self._components: Mapping[type, tuple[Any, ...]] = MappingProxyType({})
+        self._prototypes: Mapping[type, tuple[Callable[[], Any], ...]] = (
+            MappingProxyType({})
+        )
+        self._resolved_types: frozenset[type] = frozenset()
+        self._resolved = False
+        di.fork.register(self)
+
+    def add_component_type(
+        self,
+        component_type: type[T],
+        *,
+        per_process: bool = False,
+        deferred: bool = False,
+    ) -> None:
         if self._locked:
             raise ContainerLockedError
-        if component_type in self._registered:
-            raise DuplicateRegistrationError(type_or_factory=component_type)
-        self._registered.add(component_type)
-
-        ctor = inspect.signature(component_type.__init__)
-        deps = {
-            p.annotation
-            for n, p in ctor.parameters.items()
-            if n != "self" and p.annotation != inspect.Parameter.empty
-        }
-        satisfied_types = extract_satisfied_types_from_type(component_type)
-
-        self._definitions.append(
+
+        deps, satisfied_types = cached(
+            "basic-type",
+            component_type,
+            lambda: (
+                _constructor_dependencies(component_type),
+                extract_satisfied_types_from_type(component_type),
+            ),
+        )
+
+        self._register(
+            component_type,
             ComponentDefinition(
                 type=component_type,
                 satisfied_types=satisfied_types,
                 dependencies=deps,
-                implementation=None,
                 factory=None,
-            )
+                per_process=per_process,
+                deferred=deferred,
+            ),
         )
 
     def add_component_factory(
-        self, factory: typing.Callable[..., T], *, singleton: bool = True
+        self,
+        factory: typing.Callable[..., T],
+        *,
+        singleton: bool = True,
+        per_process: bool = False,
+        deferred: bool = False,
     ) -> None:
-        if not singleton:
-            msg = "Prototype support not available yet"  # pragma: no cover
-            raise ContainerError(msg) # pragma: no cover
         if self._locked:
             raise ContainerLockedError
-        if factory in self._registered:
-            raise DuplicateRegistrationError(type_or_factory=factory)
-        self._registered.add(factory)
 
-        deps = di.util.extract_dependencies_from_signature(factory)
-        return_type, satisfied_types = extract_satisfied_types_from_return_of_callable(
-            factory
+        deps, (return_type, satisfied_types) = cached(
+            "factory",
+            factory,
+            lambda: (
+                di.util.extract_dependencies_from_signature(factory),
+                extract_satisfied_types_from_return_of_callable(factory),
+            ),
         )
 
-        self._definitions.append(
+        self._register(
+            factory,
             ComponentDefinition(
                 type=return_type,
                 satisfied_types=satisfied_types,
                 dependencies=deps,
-                implementation=None,
                 factory=factory,
-            )
+                factory_builds_singleton=singleton,
+                per_process=per_process,
+                deferred=deferred,
+            ),
         )
 
+    def _register(self, key: object, definition: ComponentDefinition[Any]) -> None:
+        with self._mutex:
+            if self._locked:
+                raise ContainerLockedError
+            if key in self._registered:
+                raise DuplicateRegistrationError(type_or_factory=key)
+            self._registered.add(key)
+            self._definitions.append(definition)
+
     def get_component(self, component_type: type[T]) -> T:
         """Gets a single component from the container that satisfies the given type.
         This resolves all constructor dependencies for the component.
@@ -98,24 +154,161 @@ class BasicContainer(Container):
             raise ComponentNotFoundError(component_type=component_type)
         return maybe_component
 
-    def get_components(self, component_type: type[T]) -> list[T]:
-        if not self._locked:
-            self._resolve_all()
-        return [impl for impl in self._instances if isinstance(impl, component_type)]
+    def get_components(self, component_type: type[T]) -> Sequence[T]:
+        """Get all components that satisfy the given type in registration order.
+
+        The singletons are indexed by each type they satisfy when they are resolved,
+        so the lookup returns the same immutable tuple on every call unless
+        prototypes satisfy the type.  New instances of those are constructed on
+        every call.
+        """
+        if self._prototypes.get(component_type) == ():
+            # resolved before and no prototypes satisfy the type
+            return self._components.get(component_type, ())
+        target = lazy_target(component_type)
+        if target is not None:
+            return tuple(self._lazy_proxies(target))
+        self._ensure_resolved(component_type)
+        singletons = self._components.get(component_type, ())
+        prototypes = self._prototypes_for(component_type)
+        if not prototypes:
+            return singletons
+        return (*singletons, *(constructor() for constructor in prototypes))
 
     def get_optional_component(self, component_type: type[T]) -> T | None:
-        if not self._locked:
-            self._resolve_all()
-        return self._type_map.get(component_type)
-
-    def _resolve_all(self) -> None:
-        self._locked = True
-        resolver = Resolver(
-            definitions=self._definitions,
-            type_map=self._type_map,
-            instances=self._instances,
+        """Get a single component that satisfies the given type.
+
+        Singletons take precedence over prototypes, which are constructed on every
+        call.  A new proxy is returned for `Lazy[T]`.
+        """
+        type_map = self._type_map
+        if component_type in type_map:
+            return type_map[component_type]
+        prototypes = self._prototypes.get(component_type)
+        if prototypes:
+            return prototypes[0]()
+        target = lazy_target(component_type)
+        if target is not None:
+            return next(iter(self._lazy_proxies(target)), None)
+        self._ensure_resolved(component_type)
+        type_map = self._type_map
+        if component_type in type_map:
+            return type_map[component_type]
+        prototypes = self._prototypes_for(component_type)
+        return prototypes[0]() if prototypes else None
+
+    def is_prototype(self, component_type: type[Any]) -> bool:
+        if self._prototypes.get(component_type) or lazy_target(component_type):
+            return True
+        self._ensure_resolved(component_type)
+        if component_type in self._type_map:
+            return False
+        return bool(self._prototypes_for(component_type))
+
+    def construction_report(self) -> ConstructionReport:
+        """Timing of the singletons constructed so far.
+
+        :raises ContainerError: if the container was not created with trace=True
+        """
+        if self._tracer is None:
+            msg = "Construction tracing is not enabled"
+            raise ContainerError(msg)
+        return self._tracer.report()
+
+    def after_fork(self) -> None:
+        """Drop the per-process components, called in the child after a fork.
+
+        The components depending on them are dropped too and everything is
+        constructed again on the next lookup.  The lock is replaced as it may have
+        been held by a thread of the parent.
+        """
+        self._mutex = threading.RLock()
+        with self._mutex:
+            if self._resolver is not None:
+                self._resolver.drop_per_process()
+            self._prototypes = MappingProxyType({})
+            self._publish()
+            self._resolved_types = frozenset()
+            self._resolved = False
+
+    def _lazy_proxy(self, component_type: type[T]) -> Lazy[T]:
+        return Lazy(
+            component_type, functools.partial(self.get_component, component_type)
         )
-        resolver.resolve_all()
+
+    def _lazy_proxies(self, component_type: type) -> list[Any]:
+        """A new proxy of the type if it is provided, this locks the container."""
+        if not self._lock().provides(component_type):
+            return []
+        return [self._lazy_proxy(component_type)]
+
+    def _prototypes_for(self, component_type: type[T]) -> tuple[Callable[[], T], ...]:
+        """Constructors of the prototypes satisfying the type, kept for lookups."""
+        prototypes = self._prototypes.get(component_type)
+        if prototypes is not None:
+            return prototypes
+        with self._mutex:
+            prototypes = self._prototypes.get(component_type)
+            if prototypes is None:
+                prototypes = self._lock().prototypes(component_type)
+                self._publish()
+                self._prototypes = MappingProxyType(
+                    {**self._prototypes, component_type: prototypes}
+                )
+        return prototypes
+
+    def _ensure_resolved(self, component_type: type) -> None:
+        """Resolve the components that may satisfy the type, this locks the container.
+
+        Eager containers resolve every component but the deferred ones on the first
+        call, lazy containers only resolve the components satisfying the type.
+        Deferred components are resolved like in a lazy container.  Resolution uses
+        double checked locking so it only happens once.
+        """
+        if component_type in self._resolved_types:
+            return
+        if not self._lazy:
+            if not self._resolved:
+                with self._mutex:
+                    if not self._resolved:
+                        try:
+                            self._lock().resolve_all()
+                        finally:
+                            self._publish()
+                        self._resolved = True
+            if not self._lock().defers(component_type):
+                return
+        with self._mutex:
+            if component_type not in self._resolved_types:
+                try:
+                    self._lock().resolve_type(component_type)
+                finally:
+                    self._publish()
+                self._resolved_types = self._resolved_types | {component_type}
+
+    def _publish(self) -> None:
+        """Publish snapshots of the resolved components, the mutex must be held."""
+        if self._resolver is not None:
+            self._resolver.publish_components()
+        self._type_map = MappingProxyType(dict(self._resolved_type_map))
+        self._components = MappingProxyType(dict(self._resolved_components))
+
+    def _lock(self) -> Resolver:
+        """Lock the container, this builds the resolution plan."""
+        resolver = self._resolver
+        if resolver is None:
+            with self._mutex:
+                self._locked = True
+                if self._resolver is None:
+                    self._resolver = Resolver(
+                        definitions=self._definitions,
+                        type_map=self._resolved_type_map,
+                        components=self._resolved_components,
+                        tracer=self._tracer,
+                        lazy=self._lazy_proxy,
+                    )
+                resolver = self._resolver
+        return resolver
 
     def __iadd__(self, other: type[T] | Callable[..., T]) -> Self:
         if inspect.isclass(other):
@@ -135,6 +328,16 @@ class BasicContainer(Container):
 
     def __contains__(self, component_type: type[Any]) -> bool:
         """Container contains a component type."""
-        if not self._locked:
-            self._resolve_all()
-        return component_type in self._type_map
+        if self._lazy:
+            return self._lock().provides(component_type)
+        self._ensure_resolved(component_type)
+        return component_type in self._type_map or self._lock().provides(component_type)
+
+
+def _constructor_dependencies(component_type: type) -> set:
+    """Annotated constructor parameter types."""
+    return {
+        annotation
+        for name, annotation in di.util.parameter_types(component_type.__init__).items()
+        if name != "self"
+    }
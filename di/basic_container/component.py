@@ -27,12 +27,19 @@ T = TypeVar("T")
 def component(cls: type[T]) -> type[T]: ...  # pragma: no cover
 @overload
 def component(
-    *, container: Container = default_container
+    *,
+    container: Container = default_container,
+    per_process: bool = False,
+    deferred: bool = False,
 ) -> Callable[[type[T]], type[T]]: ...  # pragma: no cover
 
 
 def component(
-    cls: type[T] | None = None, *, container: Container = default_container
+    cls: type[T] | None = None,
+    *,
+    container: Container = default_container,
+    per_process: bool = False,
+    deferred: bool = False,
 ) -> type[T] | Callable[[type[T]], type[T]]:
     """Class decorator to register a component into a container.
 
@@ -40,7 +47,12 @@ def component(
 
     :param cls: The class to be registered, only used in no-parentheses form.
     :param container: Optional; a container instance to register the component in.
+    :param per_process: Construct the component again in forked child processes.
+    :param deferred: Only construct the component when it is looked up or needed,
+     even in an eager container.
     :return: Either the original class (if used directly), or a decorator function.
     """
 
-    return register_class_to_container(cls, container)
+    return register_class_to_container(
+        cls, container, per_process=per_process, deferred=deferred
+    )
@@ -1,27 +1,61 @@
 import dataclasses
 from collections.abc import Callable
-from typing import Generic, TypeVar
+from collections.abc import Set as AbstractSet
+from typing import Any, Generic, TypeVar
+
+from di.util import interned_types
 
 T = TypeVar("T")
 
 
-@dataclasses.dataclass
+@dataclasses.dataclass(frozen=True, slots=True)
 class ComponentDefinition(Generic[T]):
-    """Component definition."""
+    """Component definition.
+
+    Definitions are immutable and the type sets are interned, so definitions with
+    the same satisfied types or dependencies share a single frozenset.
+    """
 
     type: type[T]
     """The primary type (class) of the implementation."""
 
-    satisfied_types: set
-    """A set of types satisfied by the implementation (excluding 'object')."""
-
-    dependencies: set
-    """A set of types that are constructor dependencies of the implementation."""
+    satisfied_types: AbstractSet[Any]
+    """A frozenset of types satisfied by the implementation (excluding 'object')."""
 
-    implementation: T | None
-    """The resolved instance of the implementation, if already constructed."""
+    dependencies: AbstractSet[Any]
+    """A frozenset of types that are constructor dependencies of the implementation."""
 
     factory: Callable[..., T] | None
     """Factory to build the implementation if applicable.
 
     Must use keyword-only arguments."""
+
+    factory_builds_singleton: bool = True
+    """Factory builds a singleton.
+
+    If true, then the factory only generates once, otherwise it will always be
+    called when needed."""
+
+    per_process: bool = False
+    """The component must not be shared with forked child processes.
+
+    The instance is dropped in the child after a fork and constructed again when
+    it is needed."""
+
+    deferred: bool = False
+    """Eager resolution skips the component.
+
+    It is constructed when it is looked up, including through a `Lazy` proxy, or
+    when an eagerly constructed component depends on it."""
+
+    def __post_init__(self) -> None:
+        """Intern the type sets."""
+        object.__setattr__(
+            self, "satisfied_types", interned_types(self.satisfied_types)
+        )
+        object.__setattr__(self, "dependencies", interned_types(self.dependencies))
+
+    @property
+    def is_prototype(self) -> bool:
+        """Factory builds a new instance every time it is needed."""
+        return self.factory is not None and not self.factory_builds_singleton
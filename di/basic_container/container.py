@@ -1,4 +1,4 @@
-from collections.abc import Callable
+from collections.abc import Callable, Sequence
 from typing import (
     ParamSpec,
     Self,
@@ -14,19 +14,32 @@ P = ParamSpec("P")
 class Container(ComponentAddable):
     """Dependency injection container."""
 
-    def add_component_type(self, component_type: type[T]) -> None:
+    def add_component_type(
+        self,
+        component_type: type[T],
+        *,
+        per_process: bool = False,
+        deferred: bool = False,
+    ) -> None:
         """Add a component type into the container.
 
         This will throw a ContainerError if an attempt to add was done after the first
         get operation.
 
         :param component_type: A class type to be added as a component.
+        :param per_process: construct the component again in forked children
+        :param deferred: only construct the component when it is needed
         :return: self (for chaining)
         """
         raise NotImplementedError  # pragma: no cover
 
     def add_component_factory(
-        self, factory: Callable[P, T], *, singleton: bool = True
+        self,
+        factory: Callable[P, T],
+        *,
+        singleton: bool = True,
+        per_process: bool = False,
+        deferred: bool = False,
     ) -> None:
         """Add a component factory into the container.
 
@@ -38,6 +51,8 @@ class Container(ComponentAddable):
         :param factory: The factory that would construct the object.  The function can
         take additional kwargs which represent dependencies in the container
         :param singleton: Create singleton
+        :param per_process: construct the component again in forked children
+        :param deferred: only construct the component when it is needed
         :return: self (for chaining)
         """
         raise NotImplementedError  # pragma: no cover
@@ -67,12 +82,19 @@ class Container(ComponentAddable):
         """
         raise NotImplementedError  # pragma: no cover
 
-    def get_components(self, component_type: type[T]) -> list[T]:
+    def get_components(self, component_type: type[T]) -> Sequence[T]:
         """Get all components from the container that satisfy the given type.
 
         Returns:
-            A list of components that match the given type.
+            An immutable sequence of the components that match the given type.
+
+        """
+        raise NotImplementedError  # pragma: no cover
+
+    def is_prototype(self, component_type: type[T]) -> bool:
+        """Check if lookups of the type construct a new component every time.
 
+        The container is locked by this call.
         """
         raise NotImplementedError  # pragma: no cover
 
@@ -1,6 +1,13 @@
-from typing import Any, TypeVar, get_type_hints
+import functools
+import threading
+from collections.abc import Callable, Hashable
+from typing import Any, TypeVar
 
-from di.exceptions import ComponentNotFoundError, CycleDetectedError
+from di.exceptions import ComponentNotFoundError, ContainerError
+from di.lazy import Lazy
+from di.resolution_plan import CollectionSlot, ResolutionPlan, build_plan
+from di.tracing import ConstructionTracer
+from di.util import parameter_types
 
 from .component_definition import ComponentDefinition
 
@@ -8,62 +15,241 @@ T = TypeVar("T")
 
 
 class Resolver:
-    """Resolve components and their dependencies."""
+    """Resolve components and their dependencies.
+
+    Prototype definitions are never stored, a constructor with their singleton
+    dependencies bound is prepared on first use and called for every instance.
+
+    `list[T]` and `set[T]` parameters receive a new list or set of the components
+    satisfying `T` in registration order, as with `AioContainer`.  The elements of
+    a collection of singletons are gathered once and copied for every consumer.
+    """
 
     def __init__(
         self,
         definitions: list[ComponentDefinition[Any]],
         type_map: dict[type, Any],
-        instances: set[Any],
+        components: dict[type, tuple[Any, ...]],
+        *,
+        tracer: ConstructionTracer | None = None,
+        lazy: Callable[[Any], Lazy[Any]] | None = None,
     ):
-        self._definitions = definitions
+        """Create the resolver.
+
+        :param definitions: the definitions to resolve
+        :param type_map: receives the resolved component of each satisfied type
+        :param components: receives the resolved components satisfying each type in
+         registration order, updated by publish_components()
+        :param tracer: records the construction of each singleton
+        :param lazy: creates the proxy injected into a `Lazy[T]` parameter from `T`
+        """
+        self._tracer = tracer
+        self._lazy = lazy or _no_lazy
         self._type_map = type_map
-        self._instances = instances
-        self._resolving: set[type] = set()
-        self._type_to_definition: dict[type, ComponentDefinition] = {
-            d.type: d for d in definitions
-        }
+        self._components = components
+        self._indices: dict[type, list[int]] = {}
+        self._changed: set[type] = set()
+        self._plan = build_plan(
+            definitions,
+            parameters=_parameters,
+            construction_key=_construction_key,
+        )
+        self._deferred = frozenset(
+            index
+            for index, step in enumerate(self._plan.steps)
+            if step.definition.deferred and not step.prototype
+        )
+        self._values: dict[int, Any] = {}
+        self._constructors: dict[int, Callable[[], Any]] = {}
+        self._collections: dict[CollectionSlot, tuple[Any, ...]] = {}
+
+    @property
+    def plan(self) -> ResolutionPlan[ComponentDefinition[Any]]:
+        """The resolution plan."""
+        return self._plan
 
     def resolve_all(self) -> None:
-        """Resolve all component types in the container."""
-        for definition in self._definitions:
-            self._resolve(definition.type)
+        """Resolve all component types in the container.
+
+        Deferred components are skipped unless another component depends on them.
+        """
+        self._plan.check_cycles()
+        self._execute(self._plan.order_without(self._deferred))
+
+    def resolve_type(self, component_type: type) -> None:
+        """Resolve the components satisfying the type and their dependencies."""
+        roots = self._plan.providers.get(component_type, ())
+        self._execute(self._plan.closure(roots))
+
+    def prototypes(self, component_type: type) -> tuple[Callable[[], Any], ...]:
+        """Constructors of the prototypes satisfying the type.
 
-    def _resolve(self, component_type: type[T]) -> T:
-        if component_type in self._type_map:
-            return self._type_map[component_type]
+        The singleton dependencies of the prototypes are resolved by this call.
+        """
+        return tuple(
+            self._constructor(index)
+            for index in self._plan.providers.get(component_type, ())
+            if self._plan.steps[index].prototype
+        )
 
-        if component_type in self._resolving:
-            raise CycleDetectedError(component_type=component_type)
+    def drop_per_process(self) -> None:
+        """Forget the per-process components and everything depending on them.
 
-        definition = self._type_to_definition.get(component_type)
-        if definition is None:
-            raise ComponentNotFoundError(component_type=component_type)
+        The dropped components are constructed again when they are needed.
+        """
+        dropped = self._plan.dependents(
+            index
+            for index, step in enumerate(self._plan.steps)
+            if step.definition.per_process
+        )
+        for index in dropped:
+            self._values.pop(index, None)
+        self._constructors.clear()
+        self._collections.clear()
+        self._type_map.clear()
+        self._components.clear()
+        self._indices.clear()
+        self._changed.clear()
+        for index, instance in list(self._values.items()):
+            self._store(index, instance)
+        self.publish_components()
 
-        self._resolving.add(component_type)
+    def publish_components(self) -> None:
+        """Update the components of the types satisfied by newly resolved ones.
 
-        if definition.factory is not None:
-            factory = definition.factory
-            factory_hints = get_type_hints(factory)
+        Each tuple is rebuilt once per call rather than once per stored
+        component, so resolving many components sharing a base type stays linear.
+        """
+        for satisfied_type in self._changed:
+            indices = self._indices[satisfied_type]
+            indices.sort()
+            self._components[satisfied_type] = tuple(self._values[i] for i in indices)
+        self._changed.clear()
+
+    def defers(self, component_type: type) -> bool:
+        """Check if deferred components satisfying the type are not resolved yet."""
+        return bool(self._deferred) and any(
+            index in self._deferred and index not in self._values
+            for index in self._plan.providers.get(component_type, ())
+        )
+
+    def provides(self, component_type: type) -> bool:
+        """Check if a registered component satisfies the type."""
+        return component_type in self._plan.providers
+
+    def _execute(self, indices: tuple[int, ...]) -> None:
+        for index in indices:
+            step = self._plan.steps[index]
+            if step.prototype or index in self._values:
+                continue
+            if step.missing:
+                raise ComponentNotFoundError(component_type=step.missing[0])
+
+            tracer = self._tracer
+            start = tracer.clock() if tracer is not None else 0.0
+            definition = step.definition
             kwargs = {
-                param: self._resolve(dep_type)
-                for param, dep_type in factory_hints.items()
-                if param != "return"
+                name: self._constructor(dep)()
+                if self._plan.steps[dep].prototype
+                else self._values[dep]
+                for name, dep in step.kwargs.items()
             }
-            instance = factory(**kwargs)
+            for name, slot in step.collections.items():
+                kwargs[name] = self._collection(slot)
+            for name, lazy_type in step.lazy.items():
+                kwargs[name] = self._lazy(lazy_type)
+            ready = tracer.clock() if tracer is not None else 0.0
+            if definition.factory is not None:
+                instance = definition.factory(**kwargs)
+            else:
+                instance = definition.type(**kwargs)
+            if tracer is not None:
+                tracer.record(
+                    definition.type,
+                    lane=threading.current_thread().name,
+                    start=start,
+                    ready=ready,
+                    is_async=False,
+                )
+
+            self._store(index, instance)
+
+    def _constructor(self, index: int) -> Callable[[], Any]:
+        """Constructor of a prototype step with its singleton dependencies bound."""
+        if index in self._constructors:
+            return self._constructors[index]
+
+        self._execute(self._plan.closure([index]))
+        step = self._plan.steps[index]
+        if step.missing:
+            raise ComponentNotFoundError(component_type=step.missing[0])
+        factory = step.definition.factory or step.definition.type
+        bound = {}
+        fresh = {}
+        for name, dep in step.kwargs.items():
+            if self._plan.steps[dep].prototype:
+                fresh[name] = self._constructor(dep)
+            else:
+                bound[name] = self._values[dep]
+        for name, slot in step.collections.items():
+            fresh[name] = functools.partial(self._collection, slot)
+        for name, lazy_type in step.lazy.items():
+            fresh[name] = functools.partial(self._lazy, lazy_type)
+
+        if fresh:
+
+            def constructor() -> Any:  # noqa: ANN401
+                return factory(**bound, **{name: c() for name, c in fresh.items()})
+
         else:
-            init_hints = get_type_hints(definition.type.__init__)
-            kwargs = {
-                param: self._resolve(dep_type)
-                for param, dep_type in init_hints.items()
-                if param not in ("self", "return")
-            }
-            instance = definition.type(**kwargs)
+            constructor = functools.partial(factory, **bound)
+        self._constructors[index] = constructor
+        return constructor
+
+    def _collection(self, slot: CollectionSlot) -> Any:  # noqa: ANN401
+        """A new collection of the kind of the slot.
+
+        The elements are gathered once unless the slot holds prototypes.
+        """
+        if self._holds_prototypes(slot):
+            return slot.kind(
+                self._constructor(dep)()
+                if self._plan.steps[dep].prototype
+                else self._values[dep]
+                for dep in slot.steps
+            )
+        elements = self._collections.get(slot)
+        if elements is None:
+            elements = self._collections[slot] = tuple(
+                self._values[dep] for dep in slot.steps
+            )
+        return slot.kind(elements)
 
-        definition.implementation = instance
-        self._instances.add(instance)
+    def _holds_prototypes(self, slot: CollectionSlot) -> bool:
+        return any(self._plan.steps[dep].prototype for dep in slot.steps)
+
+    def _store(self, index: int, instance: object) -> None:
+        definition = self._plan.steps[index].definition
+        self._values[index] = instance
         for satisfied_type in definition.satisfied_types:
             self._type_map[satisfied_type] = instance
+            self._indices.setdefault(satisfied_type, []).append(index)
+            self._changed.add(satisfied_type)
+
+
+def _parameters(definition: ComponentDefinition[Any]) -> dict[str, Any]:
+    """Resolved annotations of the factory or constructor parameters."""
+    fn = definition.factory or definition.type.__init__
+    return {name: key for name, key in parameter_types(fn).items() if name != "self"}
+
+
+def _no_lazy(component_type: type) -> Lazy[Any]:
+    msg = f"Lazy {component_type} can only be injected by a container"
+    raise ContainerError(msg)
+
 
-        self._resolving.remove(component_type)
-        return instance
+def _construction_key(definition: ComponentDefinition[Any]) -> Hashable | None:
+    """Key identifying a single construction, None for prototypes."""
+    if definition.is_prototype:
+        return None
+    return definition.factory if definition.factory is not None else definition.type
@@ -0,0 +1,48 @@
+"""Fork awareness for pre-fork servers.
+
+Components are fork-safe unless they are registered with `per_process=True`.
+After `os.fork()` the child process drops the per-process components of every
+container, and the components depending on them, so they are constructed again
+on the next lookup.  Fork-safe components are shared with the parent through the
+copied memory.
+"""
+
+import os
+import weakref
+from typing import Protocol
+
+
+class ForkAware(Protocol):
+    """A container that drops its per-process components after a fork."""
+
+    def after_fork(self) -> None:
+        """Drop the per-process components, called in the child process."""
+
+
+generation = 0
+"""Number of forks this process descends from, bumped in the child after a fork.
+
+Callers that keep resolved components compare it to know when to look them up
+again.
+"""
+
+_containers: "weakref.WeakSet[ForkAware]" = weakref.WeakSet()
+
+
+def register(container: ForkAware) -> None:
+    """Call `after_fork()` of the container in the children forked from now on.
+
+    :param container: the container, it is only weakly referenced
+    """
+    _containers.add(container)
+
+
+def _after_fork_in_child() -> None:
+    global generation  # noqa: PLW0603
+    generation += 1
+    for container in list(_containers):
+        container.after_fork()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_after_fork_in_child)
@@ -0,0 +1,124 @@
+"""Deferred injection of components.
+
+A parameter annotated `Lazy[T]` receives a proxy instead of the component.  The
+proxy looks the component up on first access and keeps it, so the component is
+not needed when the consumer is constructed or called.  A component that is only
+injected through proxies is not constructed until one of them is accessed if the
+container is lazy or the component is registered with `deferred=True`.
+
+Proxies from a `BasicContainer` are resolved with `get()` or by accessing an
+attribute of the component through the proxy.  Proxies from an `AioContainer`
+are resolved with `await proxy` or `await proxy.aget()`::
+
+    @autowired
+    async def handle(*, renderer: Lazy[ReportRenderer]):
+        if wants_report:
+            await (await renderer).render()
+"""
+
+import asyncio
+import threading
+from collections.abc import Awaitable, Callable, Generator
+from typing import Any, Generic, TypeVar, cast, get_args, get_origin
+
+from .exceptions import ContainerError
+
+T = TypeVar("T")
+
+_UNSET: Any = object()
+
+
+class Lazy(Generic[T]):
+    """Proxy constructing the component on first access."""
+
+    __slots__ = (
+        "_is_async",
+        "_lock",
+        "_pending",
+        "_resolve",
+        "_value",
+        "component_type",
+    )
+
+    def __init__(
+        self,
+        component_type: type[T],
+        resolve: Callable[[], T] | Callable[[], Awaitable[T]],
+        *,
+        is_async: bool = False,
+    ) -> None:
+        """Create the proxy, this does not look the component up.
+
+        :param component_type: the type of the component
+        :param resolve: looks the component up
+        :param is_async: resolve returns an awaitable
+        """
+        self.component_type = component_type
+        """The type of the component."""
+        self._resolve = resolve
+        self._is_async = is_async
+        self._value: T = _UNSET
+        self._lock = threading.Lock()
+        self._pending: asyncio.Future[T] | None = None
+
+    def get(self) -> T:
+        """The component, looked up on the first call.
+
+        :raises ContainerError: if the proxy is resolved asynchronously
+        """
+        value = self._value
+        if value is not _UNSET:
+            return value
+        if self._is_async:
+            msg = f"Lazy {self.component_type} must be awaited"
+            raise ContainerError(msg)
+        with self._lock:
+            if self._value is _UNSET:
+                self._value = cast("Callable[[], T]", self._resolve)()
+        return self._value
+
+    async def aget(self) -> T:
+        """The component, looked up on the first call.
+
+        Concurrent first calls share a single lookup.
+        """
+        value = self._value
+        if value is not _UNSET:
+            return value
+        if not self._is_async:
+            return self.get()
+        pending = self._pending
+        if pending is None:
+            resolve = cast("Callable[[], Awaitable[T]]", self._resolve)
+            pending = self._pending = asyncio.ensure_future(resolve())
+        try:
+            value = await asyncio.shield(pending)
+        except BaseException:
+            if pending.done():
+                # allow a later access to retry the lookup
+                self._pending = None
+            raise
+        self._value = value
+        return value
+
+    def __await__(self) -> Generator[Any, None, T]:
+        """Await the component."""
+        return self.aget().__await__()
+
+    def __getattr__(self, name: str) -> Any:  # noqa: ANN401
+        """Attribute of the component, looked up on first access."""
+        return getattr(self.get(), name)
+
+    def __repr__(self) -> str:
+        """Representation showing whether the component was looked up."""
+        state = "unresolved" if self._value is _UNSET else repr(self._value)
+        name = getattr(self.component_type, "__qualname__", self.component_type)
+        return f"Lazy[{name}]({state})"
+
+
+def lazy_target(annotation: object) -> Any | None:  # noqa: ANN401
+    """The component type of a `Lazy[T]` annotation, None for other annotations."""
+    if get_origin(annotation) is Lazy:
+        (component_type,) = get_args(annotation)
+        return component_type
+    return None
@@ -0,0 +1,246 @@
+"""Optional on-disk cache of the introspected component metadata.
+
+Registering a component inspects its signature and MRO.  With the cache enabled
+the results are stored in a JSON file and reused on the next start as long as
+every module the metadata refers to is unchanged.  A module is unchanged if the
+modification time and size of its source file are the same.
+
+Enable the cache before the components are imported::
+
+    import di.metadata_cache
+
+    di.metadata_cache.enable(".di-metadata.json")
+
+Only metadata made of classes, strings and `list[T]`-style aliases of those is
+cached, and only for objects found again by looking up their qualified name in
+their module.  Anything else, including classes defined inside functions, classes
+made with `type()` and functions with a reassigned `__qualname__`, is always
+introspected.  The file is rewritten atomically when the process exits.
+"""
+
+import atexit
+import json
+import os
+import sys
+import tempfile
+import types
+from collections.abc import Callable
+from typing import Any, TypeVar
+
+T = TypeVar("T")
+
+_FORMAT = 1
+
+_active: "MetadataCache | None" = None
+
+
+class _UnsupportedError(Exception):
+    """The value cannot be stored in the cache."""
+
+
+class MetadataCache:
+    """Metadata entries stored in a JSON file."""
+
+    def __init__(self, path: str | os.PathLike[str]) -> None:
+        """Load the cache, a missing or unreadable file starts an empty cache.
+
+        :param path: the cache file
+        """
+        self._path = os.fspath(path)
+        self._entries: dict[str, Any] = {}
+        self._sources: dict[str, list[int] | None] = {}
+        self._dirty = False
+        self.hits = 0
+        """Number of lookups answered from the cache."""
+        self.misses = 0
+        """Number of lookups that needed introspection."""
+        try:
+            with open(self._path, encoding="utf-8") as f:  # noqa: PTH123
+                document = json.load(f)
+        except (OSError, ValueError):
+            return
+        if isinstance(document, dict) and document.get("format") == _FORMAT:
+            self._entries = document.get("entries", {})
+
+    def get_or_compute(self, kind: str, obj: Any, compute: Callable[[], T]) -> T:  # noqa: ANN401
+        """The cached metadata of the object, introspecting it on a miss.
+
+        :param kind: what the metadata is, entries of different kinds are separate
+        :param obj: the class or function the metadata is about
+        :param compute: introspects the object
+        """
+        key = _key(kind, obj)
+        if key is None:
+            self.misses += 1
+            return compute()
+        entry = self._entries.get(key)
+        if entry is not None and self._fresh(entry["sources"]):
+            try:
+                value = _decode(entry["value"], obj)
+            except (_UnsupportedError, LookupError, AttributeError, TypeError):
+                pass
+            else:
+                self.hits += 1
+                return value
+        self.misses += 1
+        value = compute()
+        self._store(key, obj, value)
+        return value
+
+    def save(self) -> None:
+        """Write the cache file if entries changed, replacing it atomically."""
+        if not self._dirty:
+            return
+        directory = os.path.dirname(os.path.abspath(self._path))  # noqa: PTH100, PTH120
+        document = {"format": _FORMAT, "entries": self._entries}
+        fd, temp = tempfile.mkstemp(dir=directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(document, f)
+            os.replace(temp, self._path)  # noqa: PTH105
+        except BaseException:
+            os.unlink(temp)  # noqa: PTH108
+            raise
+        self._dirty = False
+
+    def _store(self, key: str, obj: Any, value: object) -> None:  # noqa: ANN401
+        if _module_file(obj.__module__) is None:
+            return
+        modules: set[str] = {obj.__module__}
+        try:
+            encoded = _encode(value, obj, modules)
+        except _UnsupportedError:
+            return
+        sources = {}
+        for module in modules:
+            file = _module_file(module)
+            if file is None:
+                continue
+            stat = self._stat(file)
+            if stat is None:
+                return
+            sources[file] = stat
+        self._entries[key] = {"sources": sources, "value": encoded}
+        self._dirty = True
+
+    def _fresh(self, sources: dict[str, list[int] | None]) -> bool:
+        return all(self._stat(file) == stat for file, stat in sources.items())
+
+    def _stat(self, file: str) -> list[int] | None:
+        """Modification time and size of the file, checked once per process."""
+        if file not in self._sources:
+            try:
+                st = os.stat(file)  # noqa: PTH116
+            except OSError:
+                self._sources[file] = None
+            else:
+                self._sources[file] = [st.st_mtime_ns, st.st_size]
+        return self._sources[file]
+
+
+def enable(path: str | os.PathLike[str]) -> MetadataCache:
+    """Use the cache file for the components registered from now on.
+
+    The cache is saved when the process exits.
+
+    :param path: the cache file
+    :return: the active cache
+    """
+    global _active  # noqa: PLW0603
+    if _active is not None:
+        _active.save()
+        atexit.unregister(_active.save)
+    _active = MetadataCache(path)
+    atexit.register(_active.save)
+    return _active
+
+
+def disable() -> None:
+    """Save and stop using the active cache."""
+    global _active  # noqa: PLW0603
+    if _active is not None:
+        _active.save()
+        atexit.unregister(_active.save)
+    _active = None
+
+
+def cached(kind: str, obj: Any, compute: Callable[[], T]) -> T:  # noqa: ANN401
+    """The metadata of the object from the active cache, if any.
+
+    :param kind: what the metadata is, entries of different kinds are separate
+    :param obj: the class or function the metadata is about
+    :param compute: introspects the object
+    """
+    cache = _active
+    if cache is None:
+        return compute()
+    return cache.get_or_compute(kind, obj, compute)
+
+
+def _key(kind: str, obj: Any) -> str | None:  # noqa: ANN401
+    """The key of the entry, None if the object cannot be found by its name."""
+    module = getattr(obj, "__module__", None)
+    qualname = getattr(obj, "__qualname__", None)
+    if not module or not qualname or _find(module, qualname) is not obj:
+        return None
+    return f"{kind}:{module}:{qualname}"
+
+
+def _find(module: str, qualname: str) -> Any:  # noqa: ANN401
+    """The object with the qualified name in the loaded module, None if not found."""
+    found: Any = sys.modules.get(module)
+    for part in qualname.split("."):
+        found = getattr(found, part, None)
+    return found
+
+
+def _module_file(module: str) -> str | None:
+    file = getattr(sys.modules.get(module), "__file__", None)
+    return None if file is None else os.path.abspath(file)  # noqa: PTH100
+
+
+def _encode(value: object, obj: object, modules: set[str]) -> object:
+    """Encode the value as JSON, collecting the modules it refers to."""
+    if value is obj:
+        return {"self": True}
+    if isinstance(value, str):
+        return {"str": value}
+    if isinstance(value, types.GenericAlias):
+        return {
+            "alias": [
+                _encode(value.__origin__, obj, modules),
+                [_encode(arg, obj, modules) for arg in value.__args__],
+            ]
+        }
+    if isinstance(value, type):
+        if _find(value.__module__, value.__qualname__) is not value:
+            raise _UnsupportedError
+        modules.add(value.__module__)
+        return {"type": [value.__module__, value.__qualname__]}
+    if isinstance(value, set | tuple):
+        items = [_encode(item, obj, modules) for item in value]
+        return {"set" if isinstance(value, set) else "tuple": items}
+    raise _UnsupportedError
+
+
+def _decode(value: dict[str, Any], obj: object) -> Any:  # noqa: ANN401
+    (tag, data), *_ = value.items()
+    if tag == "self":
+        return obj
+    if tag == "str":
+        return data
+    if tag == "alias":
+        origin, args = data
+        return types.GenericAlias(
+            _decode(origin, obj), tuple(_decode(arg, obj) for arg in args)
+        )
+    if tag == "type":
+        found = _find(*data)
+        if not isinstance(found, type):
+            raise _UnsupportedError
+        return found
+    if tag == "set":
+        return {_decode(item, obj) for item in data}
+    if tag == "tuple":
+        return tuple(_decode(item, obj) for item in data)
+    raise _UnsupportedError
@@ -0,0 +1,64 @@
+"""Qualifiers telling apart components of the same type.
+
+A factory registers a qualified component by annotating its return type and the
+consumers select it by annotating their parameter the same way::
+
+    @factory
+    def internal_client() -> Annotated[HttpClient, Named("internal")]: ...
+
+    @autowired
+    async def sync(*, client: Annotated[HttpClient, Named("internal")]): ...
+
+A qualified component satisfies the qualified form of each of its types besides
+the types themselves.  The qualified forms are keys of the same indexes as the
+types, so a qualified lookup costs the same as an unqualified one.
+"""
+
+import dataclasses
+from collections.abc import Iterable
+from typing import Annotated, Any, get_args, get_origin
+
+
+@dataclasses.dataclass(frozen=True, slots=True)
+class Named:
+    """Qualifier selecting the components registered under the name."""
+
+    name: str
+    """The name of the component."""
+
+
+def qualifier(annotation: object) -> Named | None:
+    """The first Named qualifier of an `Annotated` annotation, if any."""
+    if get_origin(annotation) is not Annotated:
+        return None
+    _, *metadata = get_args(annotation)
+    return next((m for m in metadata if isinstance(m, Named)), None)
+
+
+def unqualified(annotation: Any) -> Any:  # noqa: ANN401
+    """The annotation without its `Annotated` metadata."""
+    if get_origin(annotation) is Annotated:
+        return get_args(annotation)[0]
+    return annotation
+
+
+def dependency_key(annotation: Any) -> Any:  # noqa: ANN401
+    """The key a parameter annotation is resolved with.
+
+    `Annotated[T, Named("x"), ...]` is keyed by `Annotated[T, Named("x")]`, other
+    `Annotated` metadata is ignored.
+    """
+    named = qualifier(annotation)
+    if named is None:
+        return unqualified(annotation)
+    return qualified(unqualified(annotation), named)
+
+
+def qualified(component_type: Any, named: Named) -> Any:  # noqa: ANN401
+    """The qualified form of the type."""
+    return Annotated[component_type, named]
+
+
+def qualified_types(types: Iterable[Any], named: Named) -> set[Any]:
+    """The qualified forms of the types."""
+    return {qualified(t, named) for t in types}
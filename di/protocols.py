@@ -7,19 +7,32 @@ R = TypeVar("R")
 
 
 class ComponentAddable(Protocol):
-    def add_component_type(self, component_type: type[T]) -> None:
+    def add_component_type(
+        self,
+        component_type: type[T],
+        *,
+        per_process: bool = False,
+        deferred: bool = False,
+    ) -> None:
         """Add a component type into the container.
 
         This will throw a ContainerError if an attempt to add was done after the first
         get operation.
 
         :param component_type: A class type to be added as a component.
+        :param per_process: the component is constructed again in forked children
+        :param deferred: only construct the component when it is needed
         :return: self (for chaining)
         """
         raise NotImplementedError  # pragma: no cover
 
     def add_component_factory(
-        self, factory: Callable[P, T], *, singleton: bool = True
+        self,
+        factory: Callable[P, T],
+        *,
+        singleton: bool = True,
+        per_process: bool = False,
+        deferred: bool = False,
     ) -> None:
         """Add a component factory into the container.
 
@@ -30,6 +43,29 @@ class ComponentAddable(Protocol):
         :param factory: The factory that would construct the object.  The function can
         take additional kwargs which represent dependencies in the container
         :param singleton: factory will generate a singleton
+        :param per_process: the component is constructed again in forked children
+        :param deferred: only construct the component when it is needed
         :return: self (for chaining)
         """
         raise NotImplementedError  # pragma: no cover
+
+
+class ScopedComponentAddable(ComponentAddable, Protocol):
+    def add_component_factory(
+        self,
+        factory: Callable[P, T],
+        *,
+        singleton: bool = True,
+        scoped: bool = False,
+        per_process: bool = False,
+        deferred: bool = False,
+    ) -> None:
+        """Add a component factory into the container.
+
+        :param factory: The factory that would construct the object
+        :param singleton: factory will generate a singleton
+        :param scoped: factory will generate one instance per scope
+        :param per_process: the component is constructed again in forked children
+        :param deferred: only construct the component when it is needed
+        """
+        raise NotImplementedError  # pragma: no cover
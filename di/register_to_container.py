@@ -1,17 +1,23 @@
 from collections.abc import Callable
-from typing import TypeVar
+from typing import TypeVar, cast
 
-from .protocols import ComponentAddable
+from .protocols import ComponentAddable, ScopedComponentAddable
 
 T = TypeVar("T")
 R = TypeVar("R")
 
 
 def register_class_to_container(
-    cls: type[T] | None, container: ComponentAddable
+    cls: type[T] | None,
+    container: ComponentAddable,
+    *,
+    per_process: bool = False,
+    deferred: bool = False,
 ) -> type[T] | Callable[[type[T]], type[T]]:
     def wrap(target_cls: type[T]) -> type[T]:
-        container.add_component_type(target_cls)
+        container.add_component_type(
+            target_cls, per_process=per_process, deferred=deferred
+        )
         return target_cls
 
     if cls is None:
@@ -19,11 +25,32 @@ def register_class_to_container(
     return wrap(cls)
 
 
-def register_factory_to_container(
-    fn: Callable[..., R] | None, container: ComponentAddable, *, singleton: bool = True
+def register_factory_to_container(  # noqa: PLR0913
+    fn: Callable[..., R] | None,
+    container: ComponentAddable,
+    *,
+    singleton: bool = True,
+    scoped: bool = False,
+    per_process: bool = False,
+    deferred: bool = False,
 ) -> Callable[..., R] | Callable[[Callable[..., R]], Callable[..., R]]:
     def wrap(target_fn: Callable[..., R]) -> Callable[..., R]:
-        container.add_component_factory(target_fn, singleton=singleton)
+        if scoped:
+            # only containers with scopes take the flag
+            cast("ScopedComponentAddable", container).add_component_factory(
+                target_fn,
+                singleton=singleton,
+                scoped=True,
+                per_process=per_process,
+                deferred=deferred,
+            )
+        else:
+            container.add_component_factory(
+                target_fn,
+                singleton=singleton,
+                per_process=per_process,
+                deferred=deferred,
+            )
         return target_fn
 
     if fn is None:
@@ -0,0 +1,306 @@
+"""Resolution plan used by both asyncio and basic resolvers.
+
+The plan is computed once when a container locks.  It deduplicates the
+definitions into construction steps, maps every constructor or factory parameter
+to the step that provides it and orders the steps topologically so the resolvers
+only need a flat loop to construct the components.
+"""
+
+import dataclasses
+import types
+from collections.abc import Callable, Hashable, Iterable, Mapping, Sequence
+from typing import Any, Generic, NamedTuple, Protocol, TypeVar, get_args, get_origin
+
+from .exceptions import CycleDetectedError
+from .lazy import lazy_target
+
+
+class Definition(Protocol):
+    """The parts of a component definition used to build a plan."""
+
+    @property
+    def type(self) -> Any: ...  # noqa: ANN401
+
+    @property
+    def satisfied_types(self) -> Any: ...  # noqa: ANN401
+
+
+D = TypeVar("D", bound=Definition)
+
+
+class CollectionSlot(NamedTuple):
+    """Steps providing the elements of a `list[T]` or `set[T]` parameter."""
+
+    kind: type
+    """Either list or set."""
+
+    steps: tuple[int, ...]
+    """Steps providing the elements in registration order."""
+
+
+@dataclasses.dataclass(frozen=True)
+class PlanStep(Generic[D]):
+    """A single construction in the plan."""
+
+    definition: D
+    """The definition that is constructed."""
+
+    kwargs: Mapping[str, int]
+    """Parameter name to the step providing the argument."""
+
+    collections: Mapping[str, CollectionSlot]
+    """Parameter name to the steps providing the collection elements."""
+
+    lazy: Mapping[str, Any]
+    """Parameter name to the type looked up by the injected `Lazy` proxy."""
+
+    inherited: Mapping[str, Any]
+    """Parameter name to the dependency type provided by a parent container."""
+
+    dependencies: tuple[int, ...]
+    """Steps that must be constructed before this one."""
+
+    missing: tuple[Any, ...]
+    """Dependency types that are not provided by any definition."""
+
+    prototype: bool
+    """A new instance is constructed for every consumer."""
+
+
+@dataclasses.dataclass(frozen=True)
+class ResolutionPlan(Generic[D]):
+    """Immutable plan to construct a set of definitions."""
+
+    steps: tuple[PlanStep[D], ...]
+    """Steps in registration order, one per unique construction."""
+
+    order: tuple[int, ...]
+    """Topological order of the steps that do not depend on a cycle."""
+
+    providers: Mapping[Any, tuple[int, ...]]
+    """Type to the steps satisfying it in registration order."""
+
+    cycles: tuple[tuple[type, ...], ...]
+    """Types of the definitions forming each cycle that was detected."""
+
+    blocked: frozenset[int]
+    """Steps that are part of, or depend on, a cycle."""
+
+    def check_cycles(self) -> None:
+        """Raise CycleDetectedError if the plan has a cycle."""
+        if self.cycles:
+            raise CycleDetectedError(component_type=self.cycles[0][0])
+
+    def closure(self, roots: Iterable[int]) -> tuple[int, ...]:
+        """Steps needed to construct the roots in topological order.
+
+        :raises CycleDetectedError: if one of the steps depends on a cycle
+        """
+        visited: set[int] = set()
+        ordered: list[int] = []
+        for root in roots:
+            stack = [(root, False)]
+            while stack:
+                index, leaving = stack.pop()
+                if leaving:
+                    ordered.append(index)
+                    continue
+                if index in visited:
+                    continue
+                if index in self.blocked:
+                    raise CycleDetectedError(
+                        component_type=self.steps[index].definition.type
+                    )
+                visited.add(index)
+                stack.append((index, True))
+                stack.extend(
+                    (dep, False)
+                    for dep in reversed(self.steps[index].dependencies)
+                    if dep not in visited
+                )
+        return tuple(ordered)
+
+    def order_without(self, skipped: Iterable[int]) -> tuple[int, ...]:
+        """The order of the steps needed by every step that is not skipped.
+
+        A skipped step is kept if a step that is not skipped depends on it.
+
+        :raises CycleDetectedError: if one of the steps depends on a cycle
+        """
+        skipped = frozenset(skipped)
+        if not skipped:
+            return self.order
+        needed = set(self.closure(i for i in self.order if i not in skipped))
+        return tuple(i for i in self.order if i in needed)
+
+    def dependents(self, roots: Iterable[int]) -> frozenset[int]:
+        """The roots and every step depending on them, directly or not.
+
+        A step with a `Lazy[T]` parameter depends on the providers of `T`, its proxy
+        keeps the component once it is accessed.
+        """
+        users: dict[int, list[int]] = {}
+        for index, step in enumerate(self.steps):
+            for dep in step.dependencies:
+                users.setdefault(dep, []).append(index)
+            for target in step.lazy.values():
+                for dep in self.providers.get(target, ()):
+                    users.setdefault(dep, []).append(index)
+        found = set(roots)
+        pending = list(found)
+        while pending:
+            for user in users.get(pending.pop(), ()):
+                if user not in found:
+                    found.add(user)
+                    pending.append(user)
+        return frozenset(found)
+
+
+def build_plan(
+    definitions: Sequence[D],
+    *,
+    parameters: Callable[[D], Mapping[str, Any]],
+    construction_key: Callable[[D], Hashable | None],
+    collections: bool = True,
+    inherited: Callable[[Any], bool] | None = None,
+) -> ResolutionPlan[D]:
+    """Build the resolution plan for the definitions.
+
+    :param definitions: the definitions in registration order
+    :param parameters: extracts the parameter name to dependency type mapping of a
+     definition
+    :param construction_key: identifies definitions that share a single
+     construction, None for prototypes which are constructed for each consumer
+    :param collections: inject `list[T]` and `set[T]` parameters with every
+     component satisfying `T`
+    :param inherited: checks if a parent container provides a type that none of
+     the definitions provide
+    :return: the plan
+
+    `Lazy[T]` parameters are not dependencies of the step, the component is looked
+    up when the proxy is first accessed.
+    """
+    step_definitions: list[D] = []
+    keys: dict[Hashable, int] = {}
+    for defn in definitions:
+        key = construction_key(defn)
+        if key is not None:
+            if key in keys:
+                continue
+            keys[key] = len(step_definitions)
+        step_definitions.append(defn)
+
+    providers: dict[Any, list[int]] = {}
+    exact: dict[Any, int] = {}
+    for index, defn in enumerate(step_definitions):
+        exact.setdefault(defn.type, index)
+        for satisfied_type in {defn.type, *defn.satisfied_types}:
+            providers.setdefault(satisfied_type, []).append(index)
+
+    steps = []
+    for defn in step_definitions:
+        kwargs: dict[str, int] = {}
+        slots: dict[str, CollectionSlot] = {}
+        lazy: dict[str, Any] = {}
+        from_parent: dict[str, Any] = {}
+        missing = []
+        for name, dep_type in parameters(defn).items():
+            origin = get_origin(dep_type)
+            args = get_args(dep_type)
+            target = lazy_target(dep_type)
+            if target is not None:
+                if target in providers or (inherited and inherited(target)):
+                    lazy[name] = target
+                else:
+                    missing.append(target)
+            elif (
+                collections
+                and origin in {list, set}
+                and args
+                and args[0] not in providers
+                and inherited
+                and inherited(args[0])
+            ):
+                from_parent[name] = dep_type
+            elif collections and origin in {list, set} and args:
+                slots[name] = CollectionSlot(
+                    kind=origin, steps=tuple(providers.get(args[0], ()))
+                )
+            elif dep_type in exact:
+                kwargs[name] = exact[dep_type]
+            elif dep_type in providers:
+                kwargs[name] = providers[dep_type][0]
+            elif inherited and inherited(dep_type):
+                from_parent[name] = dep_type
+            else:
+                missing.append(dep_type)
+        dependencies = dict.fromkeys(kwargs.values())
+        for slot in slots.values():
+            dependencies.update(dict.fromkeys(slot.steps))
+        steps.append(
+            PlanStep(
+                definition=defn,
+                kwargs=types.MappingProxyType(kwargs),
+                collections=types.MappingProxyType(slots),
+                lazy=types.MappingProxyType(lazy),
+                inherited=types.MappingProxyType(from_parent),
+                dependencies=tuple(dependencies),
+                missing=tuple(missing),
+                prototype=construction_key(defn) is None,
+            )
+        )
+
+    order, cycles, blocked = _topological_order(steps)
+    return ResolutionPlan(
+        steps=tuple(steps),
+        order=order,
+        providers=types.MappingProxyType(
+            {typ: tuple(indices) for typ, indices in providers.items()}
+        ),
+        cycles=cycles,
+        blocked=blocked,
+    )
+
+
+def _topological_order(
+    steps: list[PlanStep[Any]],
+) -> tuple[tuple[int, ...], tuple[tuple[type, ...], ...], frozenset[int]]:
+    """Depth first post-order of the steps starting in registration order.
+
+    :return: the order, the detected cycles and the steps blocked by the cycles
+    """
+    order: list[int] = []
+    cycles: list[tuple[type, ...]] = []
+    blocked: set[int] = set()
+    done: set[int] = set()
+    for root in range(len(steps)):
+        if root in done:
+            continue
+        path: list[int] = []
+        on_path: set[int] = set()
+        stack: list[tuple[int, bool]] = [(root, False)]
+        while stack:
+            index, leaving = stack.pop()
+            if leaving:
+                path.pop()
+                on_path.discard(index)
+                done.add(index)
+                if index in blocked or any(
+                    dep in blocked for dep in steps[index].dependencies
+                ):
+                    blocked.add(index)
+                else:
+                    order.append(index)
+                continue
+            if index in done:
+                continue
+            if index in on_path:
+                cycle = path[path.index(index) :]
+                cycles.append(tuple(steps[i].definition.type for i in cycle))
+                blocked.update(cycle)
+                continue
+            path.append(index)
+            on_path.add(index)
+            stack.append((index, True))
+            stack.extend((dep, False) for dep in reversed(steps[index].dependencies))
+    return tuple(order), tuple(cycles), frozenset(blocked)
@@ -0,0 +1,153 @@
+"""Construction timing of the singletons built by the resolvers.
+
+Tracing is enabled per container.  Each singleton construction records when it
+started, when its dependencies were available and when it ended, so the time
+waiting on dependencies can be told apart from the time spent in the constructor
+or factory itself.  Prototype constructions needed by a singleton are part of its
+dependency wait.
+"""
+
+import dataclasses
+import json
+import os
+import time
+from typing import IO, Any
+
+
+@dataclasses.dataclass(frozen=True)
+class ConstructionRecord:
+    """Timing of a single construction, times are `time.perf_counter()` seconds."""
+
+    component_type: type
+    """The type of the constructed component."""
+
+    lane: str
+    """Name of the thread or asyncio task that constructed the component."""
+
+    start: float
+    """When the construction started."""
+
+    ready: float
+    """When the dependencies were available."""
+
+    end: float
+    """When the component was constructed."""
+
+    is_async: bool
+    """The component was built by an async factory."""
+
+    @property
+    def duration(self) -> float:
+        """Seconds from start to end."""
+        return self.end - self.start
+
+    @property
+    def dependency_wait(self) -> float:
+        """Seconds waiting on the dependencies."""
+        return self.ready - self.start
+
+    @property
+    def self_time(self) -> float:
+        """Seconds in the constructor or factory."""
+        return self.end - self.ready
+
+
+@dataclasses.dataclass(frozen=True)
+class ConstructionReport:
+    """Construction records in completion order."""
+
+    records: tuple[ConstructionRecord, ...]
+
+    def slowest(self, count: int = 10) -> list[ConstructionRecord]:
+        """The records with the longest self time first."""
+        return sorted(self.records, key=lambda r: r.self_time, reverse=True)[:count]
+
+    def trace_events(self) -> list[dict[str, Any]]:
+        """Chrome trace events, one complete event per record.
+
+        Times are microseconds from the first construction and each lane is shown
+        as a thread.
+        """
+        if not self.records:
+            return []
+        origin = min(record.start for record in self.records)
+        lanes: dict[str, int] = {}
+        events: list[dict[str, Any]] = []
+        for record in sorted(self.records, key=lambda r: r.start):
+            if record.lane not in lanes:
+                lanes[record.lane] = len(lanes) + 1
+                events.append(
+                    {
+                        "name": "thread_name",
+                        "ph": "M",
+                        "pid": os.getpid(),
+                        "tid": lanes[record.lane],
+                        "args": {"name": record.lane},
+                    }
+                )
+            events.append(
+                {
+                    "name": record.component_type.__qualname__,
+                    "cat": "async" if record.is_async else "sync",
+                    "ph": "X",
+                    "pid": os.getpid(),
+                    "tid": lanes[record.lane],
+                    "ts": (record.start - origin) * 1e6,
+                    "dur": record.duration * 1e6,
+                    "args": {
+                        "type": f"{record.component_type.__module__}."
+                        f"{record.component_type.__qualname__}",
+                        "dependency_wait_us": record.dependency_wait * 1e6,
+                        "self_us": record.self_time * 1e6,
+                    },
+                }
+            )
+        return events
+
+    def write_chrome_trace(self, file: str | os.PathLike[str] | IO[str]) -> None:
+        """Write the Chrome trace-event JSON, loadable in a trace viewer.
+
+        :param file: path or text file to write to
+        """
+        document = {"traceEvents": self.trace_events(), "displayTimeUnit": "ms"}
+        if isinstance(file, str | os.PathLike):
+            with open(file, "w", encoding="utf-8") as f:  # noqa: PTH123
+                json.dump(document, f)
+        else:
+            json.dump(document, file)
+
+
+class ConstructionTracer:
+    """Collects the construction records of a resolver."""
+
+    def __init__(self) -> None:
+        """Create an empty tracer."""
+        self._records: list[ConstructionRecord] = []
+
+    clock = staticmethod(time.perf_counter)
+    """The clock used for the records."""
+
+    def record(
+        self,
+        component_type: type,
+        *,
+        lane: str,
+        start: float,
+        ready: float,
+        is_async: bool,
+    ) -> None:
+        """Record a construction that ends now."""
+        self._records.append(
+            ConstructionRecord(
+                component_type=component_type,
+                lane=lane,
+                start=start,
+                ready=ready,
+                end=time.perf_counter(),
+                is_async=is_async,
+            )
+        )
+
+    def report(self) -> ConstructionReport:
+        """Snapshot of the records so far."""
+        return ConstructionReport(records=tuple(self._records))
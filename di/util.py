@@ -1,20 +1,174 @@
-"""Utility functions used by both asyncio and basic containers."""
+"""Utility functions used by both asyncio and basic containers.
 
+The parameters and return type of callables are memoized in a cache keyed by weak
+references, one record per callable, so an entry is dropped when its callable is
+garbage collected.  Callables that cannot be weakly referenced, such as bound
+methods and builtins, are introspected on every call.
+"""
+
+import contextlib
+import dataclasses
 import inspect
+import types
 import typing
-from collections.abc import Awaitable, Callable, Coroutine
+import weakref
+from collections.abc import Awaitable, Callable, Coroutine, Iterable, Mapping
 from inspect import isclass
 from typing import Any
 
+from .named import dependency_key, qualified_types, qualifier, unqualified
+
+_EMPTY: Mapping[str, Any] = types.MappingProxyType({})
+
+_introspected: "weakref.WeakKeyDictionary[Any, _Introspection]" = (
+    weakref.WeakKeyDictionary()
+)
+
+# weak references hash and compare like their live referents, as in WeakSet
+_interned: "dict[weakref.ref[frozenset[Any]], weakref.ref[frozenset[Any]]]" = {}
+
+
+@dataclasses.dataclass(frozen=True, slots=True)
+class _Introspection:
+    """The resolved annotations of a callable.
+
+    The keyword-only and injectable mappings are the same object as their
+    superset when nothing is filtered out.
+    """
+
+    parameters: Mapping[str, Any]
+    keyword: Mapping[str, Any]
+    injectable: Mapping[str, Any]
+    return_type: Any
+
+
+def _introspect(fn: Callable[..., Any]) -> _Introspection:
+    """The memoized introspection record of the callable."""
+    try:
+        record = _introspected.get(fn)
+    except TypeError:
+        # not hashable or not weakly referenceable
+        return _compute_introspection(fn)
+    if record is None:
+        record = _compute_introspection(fn)
+        with contextlib.suppress(TypeError):
+            _introspected[fn] = record
+    return record
+
+
+def _compute_introspection(fn: Callable[..., Any]) -> _Introspection:
+    sig = inspect.signature(fn)
+    try:
+        hints = typing.get_type_hints(fn, include_extras=True)
+    except (NameError, TypeError):
+        hints = {}
+    parameters = {
+        name: dependency_key(hints.get(name, param.annotation))
+        for name, param in sig.parameters.items()
+        if param.annotation is not inspect.Parameter.empty
+    }
+    keyword = {
+        name: annotation
+        for name, annotation in parameters.items()
+        if sig.parameters[name].kind == inspect.Parameter.KEYWORD_ONLY
+    }
+    injectable = {
+        name: annotation
+        for name, annotation in keyword.items()
+        if sig.parameters[name].default is inspect.Parameter.empty
+    }
+    parameters_view = _frozen(parameters)
+    keyword_view = parameters_view if keyword == parameters else _frozen(keyword)
+    annotation = sig.return_annotation
+    return _Introspection(
+        parameters=parameters_view,
+        keyword=keyword_view,
+        injectable=keyword_view if injectable == keyword else _frozen(injectable),
+        return_type=(
+            annotation
+            if annotation is inspect.Signature.empty
+            else hints.get("return", annotation)
+        ),
+    )
+
+
+def _frozen(mapping: dict[str, Any]) -> Mapping[str, Any]:
+    return types.MappingProxyType(mapping) if mapping else _EMPTY
+
+
+def interned_types(types: Iterable[Any]) -> frozenset[Any]:
+    """A frozenset of the types, shared with every equal set still in use.
+
+    The interned sets are only weakly referenced so they are dropped with the
+    last definition using them.
+    """
+    candidate = frozenset(types)
+    existing = _interned.get(weakref.ref(candidate))
+    found = None if existing is None else existing()
+    if found is not None:
+        return found
+    ref = weakref.ref(candidate, _discard_interned)
+    _interned[ref] = ref
+    return candidate
+
+
+def _discard_interned(ref: "weakref.ref[frozenset[Any]]") -> None:
+    _interned.pop(ref, None)
+
+
+def signature(fn: Callable[..., Any]) -> inspect.Signature:
+    """The signature of the callable."""
+    return inspect.signature(fn)
+
+
+def type_hints(fn: Callable[..., Any]) -> Mapping[str, Any]:
+    """The type hints of the callable with forward references resolved.
+
+    `Annotated` hints are kept.
+    """
+    return typing.get_type_hints(fn, include_extras=True)
+
+
+def parameter_types(fn: Callable[..., Any]) -> Mapping[str, Any]:
+    """The memoized annotations of the annotated parameters.
+
+    Forward references are resolved with the type hints of the callable, an
+    annotation that cannot be resolved is kept as is.  Qualified annotations are
+    normalized with `di.named.dependency_key`.
+    """
+    return _introspect(fn).parameters
+
+
+def keyword_parameters(fn: Callable[..., Any]) -> Mapping[str, Any]:
+    """The memoized annotations of the annotated keyword-only parameters.
+
+    The annotations are resolved like those of `parameter_types`.
+    """
+    return _introspect(fn).keyword
+
+
+def return_type(fn: Callable[..., Any]) -> Any:  # noqa: ANN401
+    """The memoized return annotation of the callable, empty if there is none.
+
+    A forward reference is resolved like the parameter annotations.
+    """
+    return _introspect(fn).return_type
+
 
 def extract_dependencies_from_signature(fn: Callable[..., Any]) -> set[type]:
     """Extract the types of each kwarg from the callable."""
-    return {
-        param.annotation
-        for param in inspect.signature(fn).parameters.values()
-        if param.kind == param.KEYWORD_ONLY
-        and param.annotation is not inspect.Parameter.empty
-    }
+    return set(keyword_parameters(fn).values())
+
+
+def extract_injectable_parameters(fn: Callable[..., Any]) -> Mapping[str, type]:
+    """Extract the keyword-only parameters that can be injected into the callable.
+
+    Only annotated parameters without a default are injected.
+
+    :param fn: the callable
+    :returns: a mapping of parameter name to the annotated type
+    """
+    return _introspect(fn).injectable
 
 
 def extract_satisfied_types_from_return_of_callable(
@@ -25,14 +179,16 @@ def extract_satisfied_types_from_return_of_callable(
     :param fn: the callable
     :returns: a tuple of the return type and the satisfied types
     """
-    sig = inspect.signature(fn)
-    return_annotation = sig.return_annotation
+    return_annotation = return_type(fn)
 
     if return_annotation is inspect.Signature.empty:
         msg = "Return type must be known"
         raise TypeError(msg)
 
-    return return_annotation, extract_satisfied_types_from_type(return_annotation)
+    return (
+        unqualified(return_annotation),
+        extract_satisfied_types_from_type(return_annotation),
+    )
 
 
 def extract_satisfied_types_from_type(component_type: type) -> set[type]:
@@ -42,7 +198,13 @@ def extract_satisfied_types_from_type(component_type: type) -> set[type]:
     - Returns MRO for the actual type being satisfied
     - Always includes the original component_type
     - Excludes `object`
+    - Adds the qualified form of each type for `Annotated[T, Named(...)]`
     """
+    named = qualifier(component_type)
+    if named is not None:
+        satisfied_types = extract_satisfied_types_from_type(unqualified(component_type))
+        return satisfied_types | qualified_types(satisfied_types, named)
+    component_type = unqualified(component_type)
     origin = typing.get_origin(component_type)
     args = typing.get_args(component_type)
 
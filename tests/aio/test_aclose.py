@@ -0,0 +1,125 @@
+"""Closing the container releases the singletons in reverse dependency order."""
+
+import asyncio
+import time
+
+import pytest
+
+from di.aio import AioContainer, ContainerError
+
+DELAY = 0.05
+
+released: list[str] = []
+
+
+class Pool:
+    async def aclose(self) -> None:
+        await asyncio.sleep(DELAY)
+        released.append("pool")
+
+
+class Repository:
+    def __init__(self, *, pool: Pool):
+        self.pool = pool
+
+    async def close(self) -> None:
+        await asyncio.sleep(DELAY)
+        released.append("repository")
+
+
+class Cursor:
+    def __init__(self, *, repository: Repository):
+        self.repository = repository
+
+    def close(self) -> None:
+        released.append("cursor")
+
+
+class Service:
+    def __init__(self, *, cursor: Cursor):
+        self.cursor = cursor
+
+    async def __aexit__(self, *exc_info: object) -> None:
+        await asyncio.sleep(DELAY)
+        released.append("service")
+
+
+class Cache:
+    def close(self) -> None:
+        time.sleep(0)
+        released.append("cache")
+
+
+class Client:
+    async def aclose(self) -> None:
+        await asyncio.sleep(DELAY)
+        released.append("client")
+
+
+class Stuck:
+    def __init__(self, *, pool: Pool):
+        self.pool = pool
+
+    async def aclose(self) -> None:
+        await asyncio.sleep(10)
+
+
+def new_cursor(*, repository: Repository) -> Cursor:
+    return Cursor(repository=repository)
+
+
+@pytest.fixture
+def container() -> AioContainer:
+    released.clear()
+    container = AioContainer()
+    container += Service
+    container += Cache
+    container.add_component_factory(new_cursor, singleton=False)
+    container += Repository
+    container += Pool
+    container += Client()
+    return container
+
+
+async def test_reverse_dependency_order(container: AioContainer):
+    await container.get_component(Service)
+    start = time.perf_counter()
+    await container.aclose()
+    elapsed = time.perf_counter() - start
+
+    assert released.index("service") < released.index("repository")
+    assert released.index("repository") < released.index("pool")
+    assert "cache" in released
+    assert "cursor" not in released
+    assert "client" not in released
+    assert elapsed < 4 * DELAY
+
+
+async def test_lookups_fail_after_close(container: AioContainer):
+    await container.get_component(Cache)
+    await container.aclose()
+    with pytest.raises(ContainerError):
+        await container.get_component(Cache)
+    await container.aclose()
+    assert released.count("cache") == 1
+
+
+async def test_unresolved_container_closes():
+    container = AioContainer()
+    container += Cache
+    await container.aclose()
+    with pytest.raises(ContainerError):
+        await container.get_component(Cache)
+
+
+async def test_timeout_does_not_stall_shutdown():
+    released.clear()
+    container = AioContainer()
+    container += Stuck
+    container += Pool
+    await container.get_component(Stuck)
+    start = time.perf_counter()
+    with pytest.raises(TimeoutError):
+        await container.aclose(release_timeout=4 * DELAY)
+    assert time.perf_counter() - start < 1
+    assert released == ["pool"]
@@ -0,0 +1,109 @@
+"""Injection plans compiled by the `@autowired` decorator."""
+
+import pytest
+
+from di.aio import AioContainer, ContainerError, autowired
+
+
+class Service:
+    def meth(self) -> str:
+        return "service"
+
+
+class Missing:
+    def meth(self) -> str:
+        return "missing"
+
+
+container = AioContainer()
+container += Service
+
+
+@autowired(container=container)
+async def work(
+    prefix: str, *, service: Service, missing: Missing, suffix: str = "!"
+) -> str:
+    return f"{prefix} {service.meth()} {missing.meth()}{suffix}"
+
+
+@autowired(container=container)
+async def no_dependencies(value: int, *, extra: int = 1) -> int:
+    return value + extra
+
+
+async def test_caller_overrides_injectable():
+    assert await work("x", missing=Missing()) == "x service missing!"
+    assert (
+        await work("x", service=Missing(), missing=Missing(), suffix="?")
+        == "x missing missing?"
+    )
+
+
+async def test_unresolved_dependency_is_not_injected():
+    with pytest.raises(TypeError):
+        await work("x")
+
+
+async def test_defaults_are_not_injected():
+    @autowired(container=container)
+    async def with_default(*, service: Service | None = None) -> Service | None:
+        return service
+
+    assert await with_default() is None
+
+
+async def test_no_dependencies():
+    assert await no_dependencies(1) == 2
+    assert await no_dependencies(1, extra=2) == 3
+
+
+class Request:
+    pass
+
+
+def new_request() -> Request:
+    return Request()
+
+
+async def test_singletons_are_bound_once(monkeypatch: pytest.MonkeyPatch):
+    bound = AioContainer()
+    bound += Service
+    bound.add_component_factory(new_request, singleton=False)
+
+    @autowired(container=bound)
+    async def handle(*, service: Service, request: Request) -> tuple:
+        return service, request
+
+    service, first = await handle()
+    looked_up: list[dict] = []
+    resolve_dependencies = bound.resolve_dependencies
+
+    async def recording(param_types: dict) -> dict:
+        looked_up.append(dict(param_types))
+        return await resolve_dependencies(param_types)
+
+    monkeypatch.setattr(bound, "resolve_dependencies", recording)
+
+    again, second = await handle()
+    assert again is service
+    assert second is not first
+    assert looked_up == [{"request": Request}]
+
+    await handle(request=first)
+    assert looked_up == [{"request": Request}, {}]
+
+
+async def test_closed_container_is_not_injected():
+    closing = AioContainer()
+    closing += Service
+
+    @autowired(container=closing)
+    async def handle(*, service: Service) -> Service:
+        return service
+
+    await handle()
+    await closing.aclose()
+
+    assert closing.closed
+    with pytest.raises(ContainerError, match="closed"):
+        await handle()
@@ -0,0 +1,159 @@
+"""Child containers fall through to their parent for the types they lack."""
+
+from typing import Any
+
+import pytest
+
+from di.aio import AioContainer, ComponentNotFoundError, Lazy
+
+
+class Config:
+    def __init__(self):
+        self.name = "root"
+
+
+class Database:
+    def __init__(self, *, config: Config):
+        self.config = config
+
+
+class Plugin:
+    pass
+
+
+class FirstPlugin(Plugin):
+    pass
+
+
+class SecondPlugin(Plugin):
+    pass
+
+
+class Handler:
+    def __init__(self, *, database: Database, plugins: list[Plugin]):
+        self.database = database
+        self.plugins = plugins
+
+
+class Request:
+    pass
+
+
+class LazyHandler:
+    def __init__(self, *, database: Lazy[Database]):
+        self.database = database
+
+
+def request() -> Request:
+    return Request()
+
+
+@pytest.fixture(
+    params=[{}, {"lazy": True}, {"concurrent": True}],
+    ids=["eager", "lazy", "concurrent"],
+)
+def mode(request: pytest.FixtureRequest) -> dict[str, Any]:
+    return request.param
+
+
+@pytest.fixture
+def parent(mode: dict[str, Any]) -> AioContainer:
+    container = AioContainer(**mode)
+    container += Config
+    container += Database
+    container += FirstPlugin
+    container += SecondPlugin
+    return container
+
+
+async def test_inherits_parent_singletons(parent: AioContainer, mode: dict):
+    child = parent.child(**mode)
+
+    assert child.parent is parent
+    assert await child.get_component(Database) is await parent.get_component(Database)
+
+
+async def test_child_definition_depends_on_parent(parent: AioContainer, mode: dict):
+    child = parent.child(**mode)
+    child += Handler
+
+    handler = await child.get_component(Handler)
+
+    assert handler.database is await parent.get_component(Database)
+    assert handler.plugins == await parent.get_components(Plugin)
+    with pytest.raises(ComponentNotFoundError):
+        await parent.get_component(Handler)
+
+
+async def test_child_overrides_parent(parent: AioContainer, mode: dict):
+    class ChildConfig(Config):
+        def __init__(self):
+            self.name = "child"
+
+    child = parent.child(**mode)
+    child += ChildConfig
+
+    assert (await child.get_component(Config)).name == "child"
+    assert (await parent.get_component(Config)).name == "root"
+    # the parent's components keep the parent's dependencies
+    assert (await child.get_component(Database)).config.name == "root"
+
+
+async def test_lookups_are_memoized(parent: AioContainer):
+    child = parent.child()
+
+    plugins = await child.get_components(Plugin)
+
+    assert await child.get_components(Plugin) is plugins
+
+
+async def test_parent_prototypes_are_not_memoized(parent: AioContainer):
+    parent.add_component_factory(request, singleton=False)
+    child = parent.child()
+
+    first = await child.get_component(Request)
+
+    assert await child.get_component(Request) is not first
+
+
+async def test_lazy_proxy_of_parent_component(parent: AioContainer, mode: dict):
+    child = parent.child(**mode)
+    child += LazyHandler
+
+    handler = await child.get_component(LazyHandler)
+
+    assert await handler.database is await parent.get_component(Database)
+
+
+async def test_hierarchy(parent: AioContainer):
+    child = parent.child()
+    child += Handler
+    grandchild = child.child()
+
+    assert await grandchild.get_component(Handler) is await child.get_component(Handler)
+    assert await grandchild.get_component(Config) is await parent.get_component(Config)
+
+
+async def test_missing_everywhere(parent: AioContainer):
+    child = parent.child()
+
+    assert await child.get_optional_component(Request) is None
+
+
+async def test_close_child_keeps_parent(parent: AioContainer):
+    class Closing:
+        def __init__(self, *, database: Database):
+            self.database = database
+            self.closed = False
+
+        def close(self):
+            self.closed = True
+
+    child = parent.child()
+    child += Closing
+    closing = await child.get_component(Closing)
+
+    await child.aclose()
+
+    assert closing.closed
+    assert await parent.get_component(Database) is closing.database
@@ -0,0 +1,85 @@
+import asyncio
+import time
+
+import pytest
+
+from di.aio import AioContainer, autowired
+
+DELAY = 0.05
+
+
+class Database:
+    pass
+
+
+class HttpClient:
+    pass
+
+
+class Handler:
+    def __init__(self, *, database: Database, client: HttpClient):
+        self.database = database
+        self.client = client
+
+
+async def connect_database() -> Database:
+    await asyncio.sleep(DELAY)
+    return Database()
+
+
+async def connect_http_client() -> HttpClient:
+    await asyncio.sleep(DELAY)
+    return HttpClient()
+
+
+async def test_concurrent_container():
+    container = AioContainer(concurrent=True)
+    container += connect_database
+    container += connect_http_client
+    container += Handler
+
+    @autowired(container=container)
+    async def handle(*, handler: Handler) -> Handler:
+        return handler
+
+    start = time.perf_counter()
+    handler = await handle()
+    assert time.perf_counter() - start < 2 * DELAY
+    assert handler.database is await container.get_component(Database)
+    assert handler is await handle()
+
+
+class Cache:
+    pass
+
+
+class Queue:
+    pass
+
+
+async def test_first_registered_failure_is_raised():
+    constructed = []
+
+    async def connect_cache() -> Cache:
+        await asyncio.sleep(DELAY)
+        msg = "cache"
+        raise RuntimeError(msg)
+
+    async def connect_queue() -> Queue:
+        msg = "queue"
+        raise RuntimeError(msg)
+
+    async def slow_database() -> Database:
+        await asyncio.sleep(DELAY)
+        constructed.append(Database)
+        return Database()
+
+    container = AioContainer(concurrent=True)
+    container += connect_cache
+    container += connect_queue
+    container += slow_database
+
+    with pytest.raises(RuntimeError, match="cache"):
+        await container.get_component(Database)
+    # the failure of the queue does not cancel the other branches
+    assert constructed == [Database]
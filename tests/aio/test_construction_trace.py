@@ -0,0 +1,77 @@
+"""Traced containers report the construction timing of the singletons."""
+
+import asyncio
+import json
+import pathlib
+
+import pytest
+
+from di.aio import AioContainer, ContainerError
+
+DELAY = 0.02
+
+
+class Pool:
+    pass
+
+
+class Repository:
+    def __init__(self, *, pool: Pool):
+        self.pool = pool
+
+
+class Request:
+    pass
+
+
+async def connect_pool() -> Pool:
+    await asyncio.sleep(DELAY)
+    return Pool()
+
+
+def new_request() -> Request:
+    return Request()
+
+
+def traced_container(*, concurrent: bool) -> AioContainer:
+    container = AioContainer(trace=True, concurrent=concurrent)
+    container += Repository
+    container += connect_pool
+    container.add_component_factory(new_request, singleton=False)
+    return container
+
+
+@pytest.mark.parametrize("concurrent", [False, True])
+async def test_report(*, concurrent: bool):
+    container = traced_container(concurrent=concurrent)
+    await container.get_component(Request)
+    records = {r.component_type: r for r in container.construction_report().records}
+
+    assert records.keys() == {Pool, Repository}
+    assert records[Pool].is_async
+    assert records[Pool].self_time >= DELAY
+    assert not records[Repository].is_async
+    assert records[Repository].start >= records[Pool].start
+    if concurrent:
+        assert records[Repository].dependency_wait >= DELAY
+    assert container.construction_report().slowest(1) == [records[Pool]]
+
+
+async def test_chrome_trace(tmp_path: pathlib.Path):
+    container = traced_container(concurrent=False)
+    await container.get_component(Repository)
+    path = tmp_path / "startup.json"
+    container.construction_report().write_chrome_trace(path)
+
+    events = json.loads(path.read_text())["traceEvents"]
+    complete = [e for e in events if e["ph"] == "X"]
+    assert [e["name"] for e in complete] == ["Pool", "Repository"]
+    assert complete[0]["cat"] == "async"
+    assert complete[0]["ts"] == 0
+    assert complete[0]["dur"] >= DELAY * 1e6
+
+
+async def test_tracing_disabled():
+    container = AioContainer()
+    with pytest.raises(ContainerError):
+        container.construction_report()
@@ -1,6 +1,6 @@
 import pytest
 
-from di import ComponentNotFoundError
+from di import CycleDetectedError
 from di.aio import AioContainer
 
 
@@ -17,13 +17,11 @@ class B:
 async def test_cycle_detection():
     """Check to ensure the container errors out when a circular dependency is present.
 
-    The cycle itself cannot be detected because in order to create a cycle you need
-    to use forward reference or __future__.annotations.  As such the only viable
-    result is ComponentNotFoundError
+    The forward reference to B is resolved, so the cycle is detected.
     """
     container = AioContainer()
     container += A
     container += B
 
-    with pytest.raises(ComponentNotFoundError):
+    with pytest.raises(CycleDetectedError):
         await container.get_component(A)
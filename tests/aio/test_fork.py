@@ -0,0 +1,108 @@
+"""Per-process singletons are constructed again in forked children."""
+
+import asyncio
+import os
+
+import pytest
+
+from di.aio import AioContainer, Lazy
+
+
+class Config:
+    pass
+
+
+class Connection:
+    def __init__(self, *, config: Config):
+        self.config = config
+        self.pid = os.getpid()
+
+
+class Settings:
+    pass
+
+
+class Repository:
+    def __init__(self, *, connection: Connection):
+        self.connection = connection
+
+
+class Service:
+    def __init__(self, *, connection: Lazy[Connection]):
+        self.connection = connection
+
+
+async def open_connection(*, config: Config) -> Connection:
+    return Connection(config=config)
+
+
+@pytest.fixture(params=[False, True], ids=["eager", "lazy"])
+def container(request: pytest.FixtureRequest) -> AioContainer:
+    container = AioContainer(lazy=request.param)
+    container += Config
+    container.add_component_factory(open_connection, per_process=True)
+    container += Repository
+    container += Service
+    return container
+
+
+async def test_after_fork_drops_per_process_singletons(container: AioContainer):
+    config = await container.get_component(Config)
+    connection = await container.get_component(Connection)
+    repository = await container.get_component(Repository)
+
+    container.after_fork()
+
+    assert await container.get_component(Config) is config
+    new_connection = await container.get_component(Connection)
+    assert new_connection is not connection
+    new_repository = await container.get_component(Repository)
+    assert new_repository is not repository
+    assert new_repository.connection is new_connection
+    assert await container.get_components(Connection) == [new_connection]
+
+
+async def test_after_fork_before_lookup(container: AioContainer):
+    container.after_fork()
+
+    repository = await container.get_component(Repository)
+    assert repository.connection is await container.get_component(Connection)
+
+
+async def test_after_fork_drops_lazy_consumers(container: AioContainer):
+    service = await container.get_component(Service)
+    assert await service.connection is await container.get_component(Connection)
+
+    container.after_fork()
+
+    new_service = await container.get_component(Service)
+    assert new_service is not service
+    assert await new_service.connection is await container.get_component(Connection)
+
+
+async def test_after_fork_keeps_fork_safe_singletons(container: AioContainer):
+    settings = Settings()
+    container.add_component_implementation(settings)
+    config = await container.get_component(Config)
+
+    container.after_fork()
+
+    assert await container.get_component(Settings) is settings
+    assert await container.get_component(Config) is config
+
+
+@pytest.mark.skipif(not hasattr(os, "fork"), reason="requires os.fork")
+def test_forked_child_constructs_per_process_singletons(container: AioContainer):
+    connection = asyncio.run(container.get_component(Connection))
+    read, write = os.pipe()
+    pid = os.fork()
+    if pid == 0:  # pragma: no cover
+        child = asyncio.run(container.get_component(Connection))
+        ok = child is not connection and child.pid == os.getpid()
+        os.write(write, b"1" if ok else b"0")
+        os._exit(0)
+    os.close(write)
+    os.waitpid(pid, 0)
+    with os.fdopen(read, "rb") as f:
+        assert f.read() == b"1"
+    assert asyncio.run(container.get_component(Connection)) is connection
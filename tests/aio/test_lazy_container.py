@@ -0,0 +1,67 @@
+"""Lazy containers only construct the requested components."""
+
+import asyncio
+
+import pytest
+
+from di.aio import AioContainer, ContainerLockedError, autowired
+
+constructed: list[type] = []
+
+
+class Config:
+    def __init__(self):
+        constructed.append(Config)
+
+
+class Repository:
+    def __init__(self, *, config: Config):
+        constructed.append(Repository)
+        self.config = config
+
+
+class Renderer:
+    def __init__(self, *, config: Config):
+        constructed.append(Renderer)
+        self.config = config
+
+
+async def connect_repository(*, config: Config) -> Repository:
+    await asyncio.sleep(0.01)
+    return Repository(config=config)
+
+
+@pytest.fixture
+def container() -> AioContainer:
+    constructed.clear()
+    container = AioContainer(lazy=True)
+    container += Renderer
+    container += connect_repository
+    container += Config
+    return container
+
+
+async def test_only_the_subgraph_is_constructed(container: AioContainer):
+    @autowired(container=container)
+    async def handle(*, repository: Repository) -> Repository:
+        return repository
+
+    repository = await handle()
+    assert constructed == [Config, Repository]
+    with pytest.raises(ContainerLockedError):
+        container += Repository
+
+    renderer = await container.get_component(Renderer)
+    assert renderer.config is repository.config
+    assert constructed == [Config, Repository, Renderer]
+    assert await handle() is repository
+
+
+async def test_concurrent_lookups_share_singletons(container: AioContainer):
+    repositories = await asyncio.gather(
+        *(container.get_component(Repository) for _ in range(10)),
+        container.get_component(Renderer),
+    )
+    assert constructed.count(Config) == 1
+    assert constructed.count(Repository) == 1
+    assert repositories[0] is repositories[9]
@@ -0,0 +1,129 @@
+"""Lazy[T] parameters receive a proxy looking the component up on first await."""
+
+import asyncio
+
+import pytest
+
+from di.aio import AioContainer, ContainerError, Lazy, autowired, factory
+
+constructed: list[str] = []
+
+
+class Client:
+    def score(self) -> float:
+        return 0.5
+
+
+async def open_client() -> Client:
+    await asyncio.sleep(0)
+    constructed.append("client")
+    return Client()
+
+
+class Handler:
+    def __init__(self, *, client: Lazy[Client]):
+        self.client = client
+
+
+@pytest.fixture(
+    params=[{"lazy": True}, {}, {"concurrent": True}],
+    ids=["lazy", "eager", "concurrent"],
+)
+def container(request: pytest.FixtureRequest) -> AioContainer:
+    constructed.clear()
+    container = AioContainer(**request.param)
+    container += Handler
+    container += open_client
+    return container
+
+
+async def test_constructor_injection(container: AioContainer):
+    handler = await container.get_component(Handler)
+
+    assert isinstance(handler.client, Lazy)
+    client = await handler.client
+    assert client is await container.get_component(Client)
+    assert await handler.client.aget() is client
+    assert handler.client.get() is client
+    assert constructed == ["client"]
+
+
+async def test_not_constructed_until_awaited():
+    constructed.clear()
+    container = AioContainer(lazy=True)
+    container += Handler
+    container += open_client
+
+    handler = await container.get_component(Handler)
+    assert constructed == []
+    with pytest.raises(ContainerError):
+        handler.client.get()
+
+    clients = await asyncio.gather(handler.client.aget(), handler.client.aget())
+    assert clients[0] is clients[1]
+    assert constructed == ["client"]
+
+
+async def test_autowired(container: AioContainer):
+    @autowired(container=container)
+    async def handle(*, client: Lazy[Client], score: bool) -> float | None:
+        return (await client).score() if score else None
+
+    assert await handle(score=False) is None
+    assert await handle(score=True) == 0.5
+    assert constructed == ["client"]
+
+
+async def test_missing_component():
+    container = AioContainer()
+    container += Handler
+
+    assert await container.get_components(Lazy[Client]) == []
+    with pytest.raises(ContainerError):
+        await container.get_component(Handler)
+
+
+class Scorer:
+    def __init__(self, *, client: Client):
+        self.client = client
+
+
+@pytest.mark.parametrize("concurrent", [False, True], ids=["eager", "concurrent"])
+async def test_deferred_factory_skipped_by_eager_resolution(*, concurrent: bool):
+    constructed.clear()
+    container = AioContainer(concurrent=concurrent)
+    container += Handler
+    factory(container=container, deferred=True)(open_client)
+
+    handler = await container.get_component(Handler)
+    assert constructed == []
+
+    client = await handler.client
+    assert constructed == ["client"]
+    assert await container.get_components(Client) == [client]
+
+
+async def test_deferred_component_constructed_for_eager_dependent():
+    constructed.clear()
+    container = AioContainer()
+    container += Scorer
+    container.add_component_factory(open_client, deferred=True)
+
+    scorer = await container.get_component(Scorer)
+    assert constructed == ["client"]
+    assert scorer.client is await container.get_component(Client)
+
+
+async def test_deferred_autowired():
+    constructed.clear()
+    container = AioContainer()
+    container.add_component_factory(open_client, deferred=True)
+
+    @autowired(container=container)
+    async def handle(*, client: Lazy[Client], score: bool) -> float | None:
+        return (await client).score() if score else None
+
+    assert await handle(score=False) is None
+    assert constructed == []
+    assert await handle(score=True) == 0.5
+    assert constructed == ["client"]
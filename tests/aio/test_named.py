@@ -0,0 +1,68 @@
+"""Components of the same type are told apart with Named qualifiers."""
+
+from typing import Annotated
+
+import pytest
+
+from di.aio import AioContainer, ContainerError, Named, autowired
+
+
+class HttpClient:
+    def __init__(self, url: str):
+        self.url = url
+
+
+Internal = Annotated[HttpClient, Named("internal")]
+External = Annotated[HttpClient, Named("external")]
+
+
+async def internal_client() -> Internal:
+    return HttpClient("http://internal")
+
+
+def external_client() -> External:
+    return HttpClient("https://external")
+
+
+class Gateway:
+    def __init__(self, *, internal: Internal, external: External):
+        self.internal = internal
+        self.external = external
+
+
+@pytest.fixture(
+    params=[{}, {"lazy": True}, {"concurrent": True}],
+    ids=["eager", "lazy", "concurrent"],
+)
+def container(request: pytest.FixtureRequest) -> AioContainer:
+    container = AioContainer(**request.param)
+    container += Gateway
+    container += internal_client
+    container += external_client
+    return container
+
+
+async def test_constructor_injection(container: AioContainer):
+    gateway = await container.get_component(Gateway)
+
+    assert gateway.internal.url == "http://internal"
+    assert gateway.external.url == "https://external"
+
+
+async def test_lookup(container: AioContainer):
+    # Annotated forms are not type[T] for type checkers
+    internal = await container.get_component(Internal)  # pyright: ignore[reportArgumentType]
+    external = await container.get_component(External)  # pyright: ignore[reportArgumentType]
+
+    assert internal.url == "http://internal"
+    assert await container.get_components(HttpClient) == [internal, external]
+    with pytest.raises(ContainerError):
+        await container.get_optional_component(HttpClient)
+
+
+async def test_autowired(container: AioContainer):
+    @autowired(container=container)
+    async def urls(*, internal: Internal, external: External) -> tuple[str, str]:
+        return internal.url, external.url
+
+    assert await urls() == ("http://internal", "https://external")
@@ -0,0 +1,69 @@
+"""The resolved graph is cached when the container is locked."""
+
+import pytest
+
+from di.aio import AioContainer, ContainerLockedError, autowired
+
+
+class Counted:
+    def __init__(self):
+        self.instance_id = id(self)
+
+
+class Prototype:
+    def __init__(self, *, counted: Counted):
+        self.counted = counted
+
+
+async def test_autowired_reuses_resolved_graph():
+    calls = []
+
+    def make_counted() -> Counted:
+        calls.append(1)
+        return Counted()
+
+    container = AioContainer()
+    container += make_counted
+
+    @autowired(container=container)
+    async def work(*, counted: Counted) -> Counted:
+        return counted
+
+    first = await work()
+    second = await work()
+    assert first is second
+    assert len(calls) == 1
+    assert await container.get_components(Counted) == [first]
+
+
+async def test_prototypes_are_built_per_call():
+    container = AioContainer()
+    container += Counted
+
+    def make_prototype(*, counted: Counted) -> Prototype:
+        return Prototype(counted=counted)
+
+    container.add_component_factory(make_prototype, singleton=False)
+
+    @autowired(container=container)
+    async def work(*, prototype: Prototype) -> Prototype:
+        return prototype
+
+    first = await work()
+    second = await work()
+    assert first is not second
+    assert first.counted is second.counted
+    assert await container.get_component(Prototype) is not first
+
+
+async def test_autowired_locks_container():
+    container = AioContainer()
+    container += Counted
+
+    @autowired(container=container)
+    async def work(*, counted: Counted) -> Counted:
+        return counted
+
+    assert isinstance(await work(), Counted)
+    with pytest.raises(ContainerLockedError):
+        container.add_component_factory(Prototype)
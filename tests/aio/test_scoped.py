@@ -0,0 +1,198 @@
+"""Scoped components are constructed once per scope."""
+
+import asyncio
+
+import pytest
+
+from di.aio import AioContainer, ContainerError, autowired, factory
+
+events: list[str] = []
+
+
+class Config:
+    pass
+
+
+class Session:
+    def __init__(self, *, config: Config):
+        self.config = config
+
+    async def aclose(self) -> None:
+        events.append("session closed")
+
+
+class UnitOfWork:
+    def __init__(self, *, session: Session):
+        self.session = session
+
+    def close(self) -> None:
+        events.append("unit of work closed")
+
+
+class Handler:
+    def __init__(self, *, unit_of_work: UnitOfWork):
+        self.unit_of_work = unit_of_work
+
+
+class Cache:
+    def __init__(self, *, session: Session):
+        self.session = session
+
+
+async def open_session(*, config: Config) -> Session:
+    await asyncio.sleep(0.01)
+    events.append("session opened")
+    return Session(config=config)
+
+
+def new_unit_of_work(*, session: Session) -> UnitOfWork:
+    return UnitOfWork(session=session)
+
+
+def new_handler(*, unit_of_work: UnitOfWork) -> Handler:
+    return Handler(unit_of_work=unit_of_work)
+
+
+@pytest.fixture
+def container() -> AioContainer:
+    events.clear()
+    container = AioContainer()
+    container += Config
+    factory(container=container, scoped=True)(open_session)
+    container.add_component_factory(new_unit_of_work, scoped=True)
+    container.add_component_factory(new_handler, singleton=False)
+    return container
+
+
+async def test_shared_within_scope(container: AioContainer):
+    @autowired(container=container)
+    async def handle(*, handler: Handler, session: Session) -> Handler:
+        assert handler.unit_of_work.session is session
+        return handler
+
+    async with container.scope():
+        first = await handle()
+        second = await handle()
+        assert first is not second
+        assert first.unit_of_work is second.unit_of_work
+        assert first.unit_of_work is await container.get_component(UnitOfWork)
+        assert events == ["session opened"]
+    assert events == ["session opened", "unit of work closed", "session closed"]
+
+    async with container.scope():
+        third = await handle()
+    assert third.unit_of_work is not first.unit_of_work
+    assert third.unit_of_work.session.config is first.unit_of_work.session.config
+
+
+async def test_tasks_in_scope_share_instances(container: AioContainer):
+    async with container.scope():
+        sessions = await asyncio.gather(
+            *(container.get_component(Session) for _ in range(5))
+        )
+    assert all(s is sessions[0] for s in sessions)
+    assert events == ["session opened", "session closed"]
+
+
+async def test_lookup_outside_scope_is_rejected(container: AioContainer):
+    @autowired(container=container)
+    async def handle(*, session: Session) -> Session:
+        return session
+
+    with pytest.raises(ContainerError, match="scope"):
+        await container.get_component(Session)
+    with pytest.raises(ContainerError, match="scope"):
+        await handle()
+    assert events == []
+
+
+def test_scope_in_asyncio_run_is_released(container: AioContainer):
+    async def main() -> UnitOfWork:
+        async with container.scope():
+            return await container.get_component(UnitOfWork)
+
+    asyncio.run(main())
+
+    assert events == [
+        "session opened",
+        "unit of work closed",
+        "session closed",
+    ]
+
+
+def test_lookup_in_asyncio_run_without_scope_is_rejected(container: AioContainer):
+    with pytest.raises(ContainerError, match="scope"):
+        asyncio.run(container.get_component(UnitOfWork))
+
+
+async def test_nested_scope_has_new_instances(container: AioContainer):
+    async with container.scope():
+        outer = await container.get_component(Session)
+        async with container.scope():
+            assert await container.get_component(Session) is not outer
+        assert await container.get_component(Session) is outer
+
+
+async def test_singleton_cannot_depend_on_scoped():
+    container = AioContainer()
+    container += Config
+    container += Cache
+    container.add_component_factory(open_session, scoped=True)
+    with pytest.raises(ContainerError):
+        await container.get_component(Config)
+
+
+async def test_scoped_factory_looks_up_scoped_component(container: AioContainer):
+    class Audit:
+        def __init__(self, session: Session):
+            self.session = session
+
+    async def new_audit() -> Audit:
+        return Audit(await container.get_component(Session))
+
+    container.add_component_factory(new_audit, scoped=True)
+
+    async with container.scope():
+        audit = await asyncio.wait_for(container.get_component(Audit), timeout=1)
+        assert audit.session is await container.get_component(Session)
+
+
+async def test_failed_construction_is_retried(container: AioContainer):
+    attempts: list[int] = []
+
+    class Flaky:
+        pass
+
+    async def new_flaky() -> Flaky:
+        attempts.append(len(attempts))
+        await asyncio.sleep(0)
+        if len(attempts) == 1:
+            msg = "unavailable"
+            raise OSError(msg)
+        return Flaky()
+
+    container.add_component_factory(new_flaky, scoped=True)
+
+    async with container.scope():
+        results = await asyncio.gather(
+            container.get_component(Flaky),
+            container.get_component(Flaky),
+            return_exceptions=True,
+        )
+        assert [type(r) for r in results] == [OSError, OSError]
+        assert await container.get_component(Flaky) is await container.get_component(
+            Flaky
+        )
+    assert len(attempts) == 2
+
+
+@pytest.mark.parametrize(
+    "flags", [{"singleton": False}, {"per_process": True}], ids=str
+)
+def test_scoped_flag_combinations_are_rejected(flags: dict[str, bool]):
+    container = AioContainer()
+
+    with pytest.raises(ContainerError):
+        factory(container=container, scoped=True, **flags)(open_session)
+    with pytest.raises(ContainerError):
+        container.add_component_factory(open_session, scoped=True, **flags)
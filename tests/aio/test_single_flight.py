@@ -0,0 +1,63 @@
+"""The first resolution of a container is shared by concurrent callers."""
+
+import asyncio
+from typing import Any
+
+import pytest
+
+from di.aio import AioContainer, ContainerLockedError
+from di.aio_container.aio_resolver import Resolver
+
+
+class Database:
+    pass
+
+
+async def test_concurrent_first_resolution_builds_once():
+    calls = []
+
+    async def connect() -> Database:
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        return Database()
+
+    container = AioContainer()
+    container += connect
+    databases = await asyncio.gather(
+        *(container.get_component(Database) for _ in range(20))
+    )
+    assert len(calls) == 1
+    assert all(database is databases[0] for database in databases)
+
+
+async def test_empty_graph_is_resolved_once(monkeypatch):
+    calls = []
+    original = Resolver.resolve_all
+
+    async def counting_resolve(*args: Any, **kwargs: Any):  # noqa: ANN401
+        calls.append(1)
+        return await original(*args, **kwargs)
+
+    monkeypatch.setattr(Resolver, "resolve_all", counting_resolve)
+    container = AioContainer()
+    assert await container.get_components(Database) == []
+    assert await container.get_components(Database) == []
+    assert len(calls) == 1
+
+
+async def test_failed_resolution_is_retried():
+    attempts = []
+
+    def connect() -> Database:
+        attempts.append(1)
+        if len(attempts) == 1:
+            raise ConnectionError
+        return Database()
+
+    container = AioContainer()
+    container += connect
+    with pytest.raises(ConnectionError):
+        await container.get_component(Database)
+    with pytest.raises(ContainerLockedError):
+        container += Database
+    assert isinstance(await container.get_component(Database), Database)
@@ -0,0 +1,50 @@
+"""The synchronous `@autowired` decorator binds dependencies on the first call."""
+
+import pytest
+
+from di import BasicContainer, ContainerError, autowired
+
+
+class Service:
+    pass
+
+
+class CountingContainer(BasicContainer):
+    def __init__(self):
+        super().__init__()
+        self.lookups = 0
+
+    def get_optional_component(self, component_type):
+        self.lookups += 1
+        return super().get_optional_component(component_type)
+
+
+def test_dependencies_are_bound_once():
+    container = CountingContainer()
+    container += Service
+
+    @autowired(container=container)
+    def work(value: int, *, service: Service) -> tuple[int, Service]:
+        return value, service
+
+    first = work(1)
+    second = work(2)
+    assert first[1] is second[1]
+    assert second[0] == 2
+    assert container.lookups == 1
+    with pytest.raises(ContainerError):
+        container += Service
+
+
+def test_override_after_bind():
+    container = BasicContainer()
+    container += Service
+    other = Service()
+
+    @autowired(container=container)
+    def work(*, service: Service) -> Service:
+        return service
+
+    assert work() is container[Service]
+    assert work(service=other) is other
+    assert work() is container[Service]
@@ -0,0 +1,104 @@
+"""list[T] and set[T] parameters receive the components satisfying T."""
+
+import pytest
+
+from di import BasicContainer
+
+
+class Plugin:
+    pass
+
+
+class Audit(Plugin):
+    pass
+
+
+class Metrics(Plugin):
+    pass
+
+
+class Dispatcher:
+    def __init__(self, *, plugins: list[Plugin]):
+        self.plugins = plugins
+
+
+class Registry:
+    def __init__(self, *, plugins: list[Plugin], unique: set[Plugin]):
+        self.plugins = plugins
+        self.unique = unique
+
+
+class Handler:
+    def __init__(self, *, plugins: list[Plugin]):
+        self.plugins = plugins
+
+
+class Tracer(Plugin):
+    pass
+
+
+def new_handler(*, plugins: list[Plugin]) -> Handler:
+    return Handler(plugins=plugins)
+
+
+def new_tracer() -> Tracer:
+    return Tracer()
+
+
+@pytest.fixture(
+    params=[{"lazy": False}, {"lazy": True}],
+    ids=["eager", "lazy"],
+)
+def container(request: pytest.FixtureRequest) -> BasicContainer:
+    container = BasicContainer(**request.param)
+    container += Dispatcher
+    container += Metrics
+    container += Registry
+    container += Audit
+    return container
+
+
+def test_registration_order(container: BasicContainer):
+    plugins = container[Dispatcher].plugins
+
+    assert plugins == [container[Metrics], container[Audit]]
+    assert container[Registry].unique == set(plugins)
+
+
+def test_collections_match_the_annotation(container: BasicContainer):
+    plugins = container[Dispatcher].plugins
+    unique = container[Registry].unique
+
+    assert type(plugins) is list
+    assert type(unique) is set
+    assert plugins is not container[Registry].plugins
+    plugins.append(Plugin())
+    assert len(container[Registry].plugins) == 2
+
+
+def test_prototype_consumers_get_their_own_collection(container: BasicContainer):
+    container.add_component_factory(new_handler, singleton=False)
+
+    first = container[Handler]
+    second = container[Handler]
+
+    assert first is not second
+    assert first.plugins == second.plugins == container[Dispatcher].plugins
+    assert first.plugins is not second.plugins
+
+
+def test_prototype_elements_are_constructed_per_consumer(container: BasicContainer):
+    container.add_component_factory(new_tracer, singleton=False)
+
+    plugins = container[Dispatcher].plugins
+
+    assert [type(p) for p in plugins] == [Metrics, Audit, Tracer]
+    assert container[Registry].plugins[2] is not plugins[2]
+
+
+def test_empty_collections():
+    container = BasicContainer()
+    container += Registry
+
+    assert container[Registry].plugins == []
+    assert container[Registry].unique == set()
@@ -0,0 +1,69 @@
+"""Traced containers report the construction timing of the singletons."""
+
+import io
+import json
+import time
+
+import pytest
+
+from di import BasicContainer, ContainerError
+
+DELAY = 0.01
+
+
+class Config:
+    def __init__(self):
+        time.sleep(DELAY)
+
+
+class Service:
+    def __init__(self, *, config: Config):
+        self.config = config
+
+
+class Request:
+    def __init__(self, *, config: Config):
+        time.sleep(DELAY)
+        self.config = config
+
+
+class Handler:
+    def __init__(self, *, request: Request):
+        self.request = request
+
+
+def new_request(*, config: Config) -> Request:
+    return Request(config=config)
+
+
+@pytest.mark.parametrize("lazy", [False, True])
+def test_report(*, lazy: bool):
+    container = BasicContainer(trace=True, lazy=lazy)
+    container += Handler
+    container += Service
+    container += Config
+    container.add_component_factory(new_request, singleton=False)
+    container.get_component(Handler)
+    records = {r.component_type: r for r in container.construction_report().records}
+
+    assert Service not in records if lazy else Service in records
+    assert records[Config].self_time >= DELAY
+    assert records[Handler].dependency_wait >= DELAY
+    assert records[Handler].self_time < DELAY
+    assert all(not r.is_async for r in records.values())
+
+    trace = io.StringIO()
+    container.construction_report().write_chrome_trace(trace)
+    events = json.loads(trace.getvalue())["traceEvents"]
+    assert events[0] == {
+        "name": "thread_name",
+        "ph": "M",
+        "pid": events[0]["pid"],
+        "tid": 1,
+        "args": {"name": "MainThread"},
+    }
+
+
+def test_tracing_disabled():
+    with pytest.raises(ContainerError):
+        BasicContainer().construction_report()
@@ -33,7 +33,7 @@ def test_simple_usage():
     my_dep = my_container.get_component(MyDep)
     assert my_dep.meth() == "foo"
     my_classes = my_container.get_components(MyClass)
-    assert my_classes == [my_class_impl]
+    assert my_classes == (my_class_impl,)
 
 
 def test_get_components():
@@ -42,7 +42,7 @@ def test_container_resolution():
     assert resolved_first_dep.meth() == "foo"
 
     all_services = container.get_components(MainService)
-    assert all_services == [resolved_service]
+    assert all_services == (resolved_service,)
 
     all_protos = container.get_components(Proto)
     assert len(all_protos) == 2
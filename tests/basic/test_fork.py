@@ -0,0 +1,136 @@
+"""Per-process components are constructed again in forked children."""
+
+import os
+
+import pytest
+
+import di.fork
+from di import BasicContainer, Lazy, autowired
+
+
+class Config:
+    pass
+
+
+class Connection:
+    def __init__(self, *, config: Config):
+        self.config = config
+        self.pid = os.getpid()
+
+
+class Repository:
+    def __init__(self, *, connection: Connection):
+        self.connection = connection
+
+
+class Request:
+    def __init__(self, *, connection: Connection):
+        self.connection = connection
+
+
+class Service:
+    def __init__(self, *, connection: Lazy[Connection]):
+        self.connection = connection
+
+
+def new_request(*, connection: Connection) -> Request:
+    return Request(connection=connection)
+
+
+@pytest.fixture(params=[False, True], ids=["eager", "lazy"])
+def container(request: pytest.FixtureRequest) -> BasicContainer:
+    container = BasicContainer(lazy=request.param)
+    container += Config
+    container.add_component_type(Connection, per_process=True)
+    container += Repository
+    container += Service
+    container.add_component_factory(new_request, singleton=False)
+    return container
+
+
+def test_after_fork_drops_per_process_components(container: BasicContainer):
+    config = container[Config]
+    connection = container[Connection]
+    repository = container[Repository]
+
+    container.after_fork()
+
+    assert container[Config] is config
+    assert container[Connection] is not connection
+    assert container[Repository] is not repository
+    assert container[Repository].connection is container[Connection]
+    assert container[Connection].config is config
+    assert container.get_components(Connection) == (container[Connection],)
+
+
+def test_after_fork_drops_lazy_consumers(container: BasicContainer):
+    service = container[Service]
+    assert service.connection.get() is container[Connection]
+
+    container.after_fork()
+
+    assert container[Service] is not service
+    assert container[Service].connection.get() is container[Connection]
+
+
+def test_after_fork_rebinds_prototypes(container: BasicContainer):
+    container[Request]
+
+    container.after_fork()
+
+    assert container[Request].connection is container[Connection]
+
+
+def test_after_fork_before_lookup(container: BasicContainer):
+    container.after_fork()
+
+    assert container[Repository].connection is container[Connection]
+
+
+def test_autowired_looks_up_again_after_fork(container: BasicContainer):
+    @autowired(container=container)
+    def connection(*, repository: Repository) -> Connection:
+        return repository.connection
+
+    before = connection()
+    container.after_fork()
+    di.fork.generation += 1
+
+    assert connection() is not before
+    assert connection() is container[Connection]
+
+
+@pytest.mark.skipif(not hasattr(os, "fork"), reason="requires os.fork")
+def test_forked_child_constructs_per_process_components(container: BasicContainer):
+    config = container[Config]
+    connection = container[Connection]
+    read, write = os.pipe()
+    pid = os.fork()
+    if pid == 0:  # pragma: no cover
+        ok = (
+            container[Config] is config
+            and container[Connection] is not connection
+            and container[Connection].pid == os.getpid()
+        )
+        os.write(write, b"1" if ok else b"0")
+        os._exit(0)
+    os.close(write)
+    os.waitpid(pid, 0)
+    with os.fdopen(read, "rb") as f:
+        assert f.read() == b"1"
+    assert container[Connection] is connection
+
+
+@pytest.mark.skipif(not hasattr(os, "fork"), reason="requires os.fork")
+def test_forked_child_reconnects_lazy_consumers(container: BasicContainer):
+    assert container[Service].connection.pid == os.getpid()
+    read, write = os.pipe()
+    pid = os.fork()
+    if pid == 0:  # pragma: no cover
+        ok = container[Service].connection.pid == os.getpid()
+        os.write(write, b"1" if ok else b"0")
+        os._exit(0)
+    os.close(write)
+    os.waitpid(pid, 0)
+    with os.fdopen(read, "rb") as f:
+        assert f.read() == b"1"
@@ -0,0 +1,119 @@
+"""get_components returns the indexed singletons in registration order."""
+
+import dataclasses
+from typing import Any
+
+import pytest
+
+from di import BasicContainer
+from di.basic_container.component_definition import ComponentDefinition
+from di.basic_container.resolver import Resolver
+
+
+class Plugin:
+    pass
+
+
+class First(Plugin):
+    pass
+
+
+class Second(Plugin):
+    def __init__(self, *, first: First):
+        self.first = first
+
+
+@dataclasses.dataclass
+class Settings(Plugin):
+    name: str = "settings"
+
+
+def new_settings() -> Settings:
+    return Settings()
+
+
+class Scratch(Plugin):
+    pass
+
+
+def new_scratch() -> Scratch:
+    return Scratch()
+
+
+@pytest.fixture(params=[False, True], ids=["eager", "lazy"])
+def container(request: pytest.FixtureRequest) -> BasicContainer:
+    container = BasicContainer(lazy=request.param)
+    container += Second
+    container += new_settings
+    container += First
+    return container
+
+
+def test_registration_order(container: BasicContainer):
+    plugins = container.get_components(Plugin)
+
+    assert [type(p) for p in plugins] == [Second, Settings, First]
+    assert container[Second].first is plugins[2]
+
+
+def test_same_immutable_sequence(container: BasicContainer):
+    plugins = container.get_components(Plugin)
+
+    assert isinstance(plugins, tuple)
+    assert container.get_components(Plugin) is plugins
+
+
+def test_unhashable_components(container: BasicContainer):
+    with pytest.raises(TypeError):
+        hash(Settings())
+
+    assert container.get_components(Settings) == (Settings(),)
+    assert container[Settings] is container.get_components(Settings)[0]
+
+
+def test_prototypes_after_singletons(container: BasicContainer):
+    container.add_component_factory(new_scratch, singleton=False)
+
+    plugins = container.get_components(Plugin)
+
+    assert [type(p) for p in plugins] == [Second, Settings, First, Scratch]
+    assert container.get_components(Plugin)[3] is not plugins[3]
+
+
+def test_unknown_type(container: BasicContainer):
+    assert container.get_components(int) == ()
+
+
+class CountingDict(dict):
+    """Dictionary counting the stored values."""
+
+    def __init__(self):
+        super().__init__()
+        self.stored = 0
+
+    def __setitem__(self, key: object, value: object):
+        self.stored += 1
+        super().__setitem__(key, value)
+
+
+def test_components_indexed_once_per_resolution():
+    """Resolving N components sharing a base type builds its tuple once."""
+    types = [type(f"Plugin{i}", (Plugin,), {}) for i in range(200)]
+    definitions: list[ComponentDefinition[Any]] = [
+        ComponentDefinition(
+            type=component_type,
+            satisfied_types={component_type, Plugin},
+            dependencies=set(),
+            factory=None,
+        )
+        for component_type in types
+    ]
+    components = CountingDict()
+    resolver = Resolver(definitions, type_map={}, components=components)
+
+    resolver.resolve_all()
+    resolver.publish_components()
+
+    # each generated type and Plugin
+    assert components.stored == len(types) + 1
+    assert [type(p) for p in components[Plugin]] == types
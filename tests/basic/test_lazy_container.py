@@ -0,0 +1,88 @@
+"""Lazy containers only construct the requested components."""
+
+import typing
+
+import pytest
+
+from di import BasicContainer, ComponentNotFoundError, ContainerError
+
+constructed: list[type] = []
+
+
+@typing.runtime_checkable
+class Proto(typing.Protocol):
+    def meth(self) -> str: ...
+
+
+class Config:
+    def __init__(self):
+        constructed.append(Config)
+
+
+class Repository(Proto):
+    def __init__(self, *, config: Config):
+        constructed.append(Repository)
+        self.config = config
+
+    def meth(self) -> str:
+        return "repository"
+
+
+class Service:
+    def __init__(self, *, proto: Proto):
+        constructed.append(Service)
+        self.proto = proto
+
+
+class Renderer:
+    def __init__(self, *, config: Config):
+        constructed.append(Renderer)
+        self.config = config
+
+
+class Broken:
+    def __init__(self, *, missing: typing.Sized):
+        self.missing = missing
+
+
+@pytest.fixture
+def container() -> BasicContainer:
+    constructed.clear()
+    container = BasicContainer(lazy=True)
+    container += Service
+    container += Renderer
+    container += Repository
+    container += Config
+    return container
+
+
+def test_only_the_subgraph_is_constructed(container: BasicContainer):
+    service = container[Service]
+    assert service.proto.meth() == "repository"
+    assert constructed == [Config, Repository, Service]
+
+    renderer = container[Renderer]
+    assert renderer.config is container[Config]
+    assert constructed == [Config, Repository, Service, Renderer]
+
+
+def test_container_locks_on_first_lookup(container: BasicContainer):
+    assert Renderer in container
+    assert constructed == []
+    with pytest.raises(ContainerError):
+        container += Broken
+
+
+def test_get_components(container: BasicContainer):
+    assert [type(p) for p in container.get_components(Proto)] == [Repository]
+    assert Service not in constructed
+
+
+def test_failed_lookup_can_be_retried():
+    container = BasicContainer(lazy=True)
+    container += Broken
+    container += Config
+    for _ in range(2):
+        with pytest.raises(ComponentNotFoundError):
+            container.get_component(Broken)
+    assert isinstance(container[Config], Config)
@@ -0,0 +1,159 @@
+"""Lazy[T] parameters receive a proxy looking the component up on first access."""
+
+import pytest
+
+from di import BasicContainer, ComponentNotFoundError, Lazy, autowired, component
+
+constructed: list[str] = []
+
+
+class Renderer:
+    def __init__(self):
+        constructed.append("renderer")
+
+    def render(self) -> str:
+        return "report"
+
+
+class Handler:
+    def __init__(self, *, renderer: Lazy[Renderer]):
+        self.renderer = renderer
+
+
+class Parent:
+    def __init__(self, *, child: "Child"):
+        self.child = child
+
+
+class Child:
+    def __init__(self, *, parent: Lazy[Parent]):
+        self.parent = parent
+
+
+class Scratch:
+    pass
+
+
+def new_scratch() -> Scratch:
+    return Scratch()
+
+
+@pytest.fixture(
+    params=[{"lazy": True}, {"lazy": False}],
+    ids=["lazy", "eager"],
+)
+def container(request: pytest.FixtureRequest) -> BasicContainer:
+    constructed.clear()
+    container = BasicContainer(**request.param)
+    container += Handler
+    container += Renderer
+    return container
+
+
+def test_constructor_injection(container: BasicContainer):
+    handler = container[Handler]
+
+    assert isinstance(handler.renderer, Lazy)
+    assert handler.renderer.get() is container[Renderer]
+    assert handler.renderer.get() is handler.renderer.get()
+    assert handler.renderer.render() == "report"
+    assert constructed == ["renderer"]
+
+
+def test_not_constructed_until_accessed():
+    constructed.clear()
+    container = BasicContainer(lazy=True)
+    container += Handler
+    container += Renderer
+
+    handler = container[Handler]
+    assert constructed == []
+    assert "unresolved" in repr(handler.renderer)
+
+    assert handler.renderer.render() == "report"
+    assert constructed == ["renderer"]
+
+
+def test_autowired(container: BasicContainer):
+    @autowired(container=container)
+    def handle(*, renderer: Lazy[Renderer], render: bool) -> str | None:
+        return renderer.render() if render else None
+
+    assert handle(render=False) is None
+    assert handle(render=True) == "report"
+    assert constructed == ["renderer"]
+
+
+def test_breaks_cycle():
+    container = BasicContainer()
+    container += Parent
+    container += Child
+
+    parent = container[Parent]
+    assert parent.child.parent.get() is parent
+
+
+def test_prototype_is_constructed_per_proxy():
+    container = BasicContainer()
+    container.add_component_factory(new_scratch, singleton=False)
+
+    first = container[Lazy[Scratch]]
+    second = container[Lazy[Scratch]]
+
+    assert first.get() is first.get()
+    assert first.get() is not second.get()
+
+
+def test_missing_component():
+    container = BasicContainer()
+    container += Handler
+
+    assert container.get_optional_component(Lazy[Renderer]) is None
+    assert container.get_components(Lazy[Renderer]) == ()
+    with pytest.raises(ComponentNotFoundError):
+        container[Handler]
+
+
+class Report:
+    def __init__(self, *, renderer: Renderer):
+        self.renderer = renderer
+
+
+def test_deferred_component_skipped_by_eager_resolution():
+    constructed.clear()
+    container = BasicContainer()
+    container += Handler
+    container.add_component_type(Renderer, deferred=True)
+
+    handler = container[Handler]
+    assert constructed == []
+
+    assert handler.renderer.render() == "report"
+    assert constructed == ["renderer"]
+    assert container.get_components(Renderer) == (handler.renderer.get(),)
+
+
+def test_deferred_component_constructed_for_eager_dependent():
+    constructed.clear()
+    container = BasicContainer()
+    container += Report
+    container.add_component_type(Renderer, deferred=True)
+
+    assert constructed == []
+    assert container[Report].renderer is container[Renderer]
+    assert constructed == ["renderer"]
+
+
+def test_deferred_autowired():
+    constructed.clear()
+    container = BasicContainer()
+    component(container=container, deferred=True)(Renderer)
+
+    @autowired(container=container)
+    def handle(*, renderer: Lazy[Renderer], render: bool) -> str | None:
+        return renderer.render() if render else None
+
+    assert handle(render=False) is None
+    assert constructed == []
+    assert handle(render=True) == "report"
+    assert constructed == ["renderer"]
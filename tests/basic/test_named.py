@@ -0,0 +1,90 @@
+"""Components of the same type are told apart with Named qualifiers."""
+
+from typing import Annotated
+
+import pytest
+
+from di import BasicContainer, ContainerError, Named, autowired
+
+
+class Client:
+    def __init__(self, url: str):
+        self.url = url
+
+
+class HttpClient(Client):
+    pass
+
+
+Internal = Annotated[HttpClient, Named("internal")]
+External = Annotated[HttpClient, Named("external")]
+
+
+def internal_client() -> Internal:
+    return HttpClient("http://internal")
+
+
+def external_client() -> Annotated[HttpClient, Named("external"), "documented"]:
+    return HttpClient("https://external")
+
+
+class Gateway:
+    def __init__(self, *, internal: Internal, external: External):
+        self.internal = internal
+        self.external = external
+
+
+class Proxy:
+    def __init__(self, *, client: Annotated[Client, Named("external")]):
+        self.client = client
+
+
+@pytest.fixture(
+    params=[{"lazy": False}, {"lazy": True}],
+    ids=["eager", "lazy"],
+)
+def container(request: pytest.FixtureRequest) -> BasicContainer:
+    container = BasicContainer(**request.param)
+    container += Gateway
+    container += internal_client
+    container += external_client
+    container += Proxy
+    return container
+
+
+def test_constructor_injection(container: BasicContainer):
+    gateway = container[Gateway]
+
+    assert gateway.internal.url == "http://internal"
+    assert gateway.external.url == "https://external"
+    assert container[Proxy].client is gateway.external
+
+
+def test_lookup(container: BasicContainer):
+    # Annotated forms are not type[T] for type checkers
+    internal = container[Internal]  # pyright: ignore[reportArgumentType]
+    external = container[External]  # pyright: ignore[reportArgumentType]
+    client = container[Annotated[Client, Named("internal")]]  # pyright: ignore[reportArgumentType]
+    unknown = Annotated[HttpClient, Named("unknown")]
+
+    assert internal.url == "http://internal"
+    assert client is internal
+    assert container.get_components(HttpClient) == (internal, external)
+    assert container.get_optional_component(unknown) is None  # pyright: ignore[reportArgumentType]
+
+
+def test_autowired(container: BasicContainer):
+    @autowired(container=container)
+    def urls(*, internal: Internal, external: External) -> tuple[str, str]:
+        return internal.url, external.url
+
+    assert urls() == ("http://internal", "https://external")
+
+
+def test_missing_qualifier():
+    container = BasicContainer()
+    container += Gateway
+    container += internal_client
+
+    with pytest.raises(ContainerError):
+        container[Gateway]
@@ -0,0 +1,89 @@
+"""Prototype factories construct a new component on every lookup."""
+
+import pytest
+
+import di.basic_container.resolver
+from di import BasicContainer, autowired
+
+calls: list[str] = []
+
+
+class Config:
+    def __init__(self):
+        calls.append("config")
+
+
+class Session:
+    def __init__(self, *, config: Config):
+        self.config = config
+
+
+class Request:
+    def __init__(self, *, session: Session, config: Config):
+        self.session = session
+        self.config = config
+
+
+class Service:
+    def __init__(self, *, session: Session):
+        self.session = session
+
+
+def new_session(*, config: Config) -> Session:
+    return Session(config=config)
+
+
+def new_request(*, session: Session, config: Config) -> Request:
+    return Request(session=session, config=config)
+
+
+@pytest.fixture(params=[False, True], ids=["eager", "lazy"])
+def container(request: pytest.FixtureRequest) -> BasicContainer:
+    calls.clear()
+    container = BasicContainer(lazy=request.param)
+    container.add_component_factory(new_request, singleton=False)
+    container.add_component_factory(new_session, singleton=False)
+    container += Service
+    container += Config
+    return container
+
+
+def test_new_instance_per_lookup(container: BasicContainer):
+    first = container[Request]
+    second = container[Request]
+    assert first is not second
+    assert first.session is not second.session
+    assert first.config is second.config is container[Config]
+    assert calls == ["config"]
+    assert Request in container
+
+
+def test_singletons_get_their_own_prototype(container: BasicContainer):
+    service = container[Service]
+    assert service is container[Service]
+    assert service.session is not container[Session]
+    assert [type(s) for s in container.get_components(Session)] == [Session]
+    assert container.get_components(Session)[0] is not service.session
+
+
+def test_lookup_does_not_inspect_types(
+    container: BasicContainer, monkeypatch: pytest.MonkeyPatch
+):
+    container.get_component(Request)
+
+    def fail(*_: object) -> None:
+        pytest.fail("type hints inspected on lookup")
+
+    monkeypatch.setattr(di.basic_container.resolver, "parameter_types", fail)
+    assert container.get_component(Request) is not container.get_component(Request)
+
+
+def test_autowired_does_not_keep_prototypes(container: BasicContainer):
+    @autowired(container=container)
+    def handle(*, request: Request, config: Config) -> Request:
+        assert config is request.config
+        return request
+
+    assert handle() is not handle()
+    request = Request(session=Session(config=Config()), config=container[Config])
+    assert handle(request=request) is request
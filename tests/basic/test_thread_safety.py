@@ -0,0 +1,80 @@
+"""Concurrent first lookups construct every singleton once."""
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from di import BasicContainer
+
+THREADS = 16
+
+constructed: list[type] = []
+constructed_lock = threading.Lock()
+
+
+def record(component_type: type) -> None:
+    time.sleep(0.001)
+    with constructed_lock:
+        constructed.append(component_type)
+
+
+class Config:
+    def __init__(self):
+        record(Config)
+
+
+class Repository:
+    def __init__(self, *, config: Config):
+        record(Repository)
+        self.config = config
+
+
+class Service:
+    def __init__(self, *, repository: Repository, config: Config):
+        record(Service)
+        self.repository = repository
+        self.config = config
+
+
+class Request:
+    def __init__(self, *, service: Service):
+        self.service = service
+
+
+def new_request(*, service: Service) -> Request:
+    return Request(service=service)
+
+
+@pytest.mark.parametrize("lazy", [False, True], ids=["eager", "lazy"])
+def test_concurrent_first_lookup(*, lazy: bool):
+    for _ in range(20):
+        constructed.clear()
+        container = BasicContainer(lazy=lazy)
+        container += Service
+        container += Repository
+        container += Config
+        container.add_component_factory(new_request, singleton=False)
+        barrier = threading.Barrier(THREADS)
+
+        def lookup(
+            index: int,
+            container: BasicContainer = container,
+            barrier: threading.Barrier = barrier,
+        ) -> Service:
+            barrier.wait()
+            if index % 2:
+                return container.get_component(Request).service
+            return container[Service]
+
+        with ThreadPoolExecutor(THREADS) as pool:
+            services = list(pool.map(lookup, range(THREADS)))
+
+        assert sorted(constructed, key=lambda t: t.__name__) == [
+            Config,
+            Repository,
+            Service,
+        ]
+        assert all(service is services[0] for service in services)
+        assert services[0].repository.config is services[0].config
@@ -0,0 +1,155 @@
+import importlib
+import os
+import pathlib
+import sys
+from collections.abc import Iterator
+
+import pytest
+
+import di.metadata_cache
+from di import BasicContainer
+from di.aio import AioContainer
+
+BASES = """
+class Proto:
+    pass
+"""
+
+COMPONENTS = """
+from bases import Proto
+
+
+class Config:
+    pass
+
+
+class Service(Proto):
+    def __init__(self, *, config: Config, protos: list[Proto], later: "Later"):
+        self.config = config
+
+
+class Later:
+    pass
+
+
+def make_later(*, config: Config) -> Later:
+    return Later()
+"""
+
+
+@pytest.fixture
+def modules(tmp_path: pathlib.Path) -> Iterator[pathlib.Path]:
+    (tmp_path / "bases.py").write_text(BASES)
+    (tmp_path / "components.py").write_text(COMPONENTS)
+    sys.path.insert(0, str(tmp_path))
+    yield tmp_path
+    sys.path.remove(str(tmp_path))
+    for name in ("bases", "components"):
+        sys.modules.pop(name, None)
+    di.metadata_cache.disable()
+
+
+def start(cache_file: pathlib.Path) -> tuple[di.metadata_cache.MetadataCache, list]:
+    """Import the components and register them as a new process would."""
+    for name in ("bases", "components"):
+        sys.modules.pop(name, None)
+    importlib.invalidate_caches()
+    cache = di.metadata_cache.enable(cache_file)
+    components = importlib.import_module("components")
+    aio = AioContainer()
+    aio += components.Service
+    aio += components.make_later
+    basic = BasicContainer()
+    basic += components.Service
+    basic += components.Config
+    definitions = [
+        (d.type, d.satisfied_types, d.dependencies)
+        for d in [*aio._definitions, *basic._definitions]  # noqa: SLF001
+    ]
+    di.metadata_cache.disable()
+    return cache, definitions
+
+
+def touch(path: pathlib.Path, text: str) -> None:
+    path.write_text(text)
+    st = path.stat()
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 10**9))
+
+
+def test_unchanged_modules_skip_introspection(modules: pathlib.Path):
+    cache_file = modules / "cache.json"
+    cold, expected = start(cache_file)
+    assert (cold.hits, cold.misses) == (0, 4)
+
+    warm, definitions = start(cache_file)
+    assert (warm.hits, warm.misses) == (4, 0)
+    components = sys.modules["components"]
+    assert definitions[0][2] == {
+        components.Config,
+        list[components.Proto],
+        components.Later,
+    }
+    assert [
+        (t.__qualname__, {s.__qualname__ for s in st}) for t, st, _ in definitions
+    ] == [(t.__qualname__, {s.__qualname__ for s in st}) for t, st, _ in expected]
+
+
+def test_changed_module_is_introspected_again(modules: pathlib.Path):
+    cache_file = modules / "cache.json"
+    start(cache_file)
+    touch(modules / "bases.py", BASES + "\n\nclass Other:\n    pass\n")
+    cache, _ = start(cache_file)
+    # only the metadata of Service refers to the changed module
+    assert (cache.hits, cache.misses) == (2, 2)
+
+    touch(modules / "components.py", COMPONENTS.replace("Proto):", "object):", 1))
+    cache, definitions = start(cache_file)
+    assert cache.misses == 4
+    assert {s.__qualname__ for s in definitions[0][1]} == {"Service"}
+
+
+def test_unreadable_cache_starts_empty(modules: pathlib.Path):
+    cache_file = modules / "cache.json"
+    cache_file.write_text("{not json")
+    cache, _ = start(cache_file)
+    assert cache.misses == 4
+    assert start(cache_file)[0].hits == 4
+
+
+def test_local_classes_are_not_cached(tmp_path: pathlib.Path):
+    class Local:
+        pass
+
+    cache = di.metadata_cache.enable(tmp_path / "cache.json")
+    try:
+        container = AioContainer()
+        container += Local
+        assert cache.misses == 1
+        cache.save()
+        assert not (tmp_path / "cache.json").exists()
+    finally:
+        di.metadata_cache.disable()
+
+
+def test_generated_objects_are_not_cached(tmp_path: pathlib.Path):
+    generated = type("Generated", (), {})
+
+    def make() -> int:
+        return 1
+
+    make.__qualname__ = "make"
+
+    cache = di.metadata_cache.enable(tmp_path / "cache.json")
+    try:
+        container = AioContainer()
+        container += generated
+        container += make
+        assert cache.misses == 2
+        cache.save()
+        assert not (tmp_path / "cache.json").exists()
+    finally:
+        di.metadata_cache.disable()
+
+
+def test_disabled_by_default():
+    assert di.metadata_cache.cached("kind", object, lambda: 1) == 1
@@ -0,0 +1,138 @@
+import dataclasses
+
+import pytest
+
+from di.exceptions import CycleDetectedError
+from di.resolution_plan import CollectionSlot, build_plan
+
+
+@dataclasses.dataclass
+class Definition:
+    type: type
+    satisfied_types: set
+    parameters: dict
+    key: object = None
+
+
+class Base:
+    pass
+
+
+class First(Base):
+    pass
+
+
+class Second(Base):
+    pass
+
+
+class Consumer:
+    pass
+
+
+class Other:
+    pass
+
+
+def definition(typ: type, key: object = "type", **parameters: object) -> Definition:
+    return Definition(
+        type=typ,
+        satisfied_types=set(typ.mro()) - {object},
+        parameters=parameters,
+        key=typ if key == "type" else key,
+    )
+
+
+def plan_for(*definitions: Definition, collections: bool = True):
+    return build_plan(
+        definitions,
+        parameters=lambda d: d.parameters,
+        construction_key=lambda d: d.key,
+        collections=collections,
+    )
+
+
+def test_topological_order():
+    plan = plan_for(
+        definition(Consumer, first=First, bases=list[Base]),
+        definition(First),
+        definition(Second),
+    )
+    assert [plan.steps[i].definition.type for i in plan.order] == [
+        First,
+        Second,
+        Consumer,
+    ]
+    consumer = plan.steps[0]
+    assert consumer.kwargs == {"first": 1}
+    assert consumer.collections == {"bases": CollectionSlot(list, (1, 2))}
+    assert consumer.dependencies == (1, 2)
+    assert plan.providers[Base] == (1, 2)
+
+
+def test_order_without_keeps_needed_steps():
+    plan = plan_for(
+        definition(Consumer, first=First),
+        definition(First),
+        definition(Second),
+        definition(Other),
+    )
+
+    assert plan.order_without([]) is plan.order
+    assert [plan.steps[i].definition.type for i in plan.order_without([1, 2])] == [
+        First,
+        Consumer,
+        Other,
+    ]
+
+
+def test_exact_type_is_preferred():
+    plan = plan_for(definition(First), definition(Base), definition(Consumer, b=Base))
+    assert plan.steps[2].kwargs == {"b": 1}
+
+
+def test_shared_construction_key():
+    plan = plan_for(definition(First, key="factory"), definition(First, key="factory"))
+    assert len(plan.steps) == 1
+
+
+def test_prototypes():
+    plan = plan_for(definition(First, key=None))
+    assert plan.steps[0].prototype
+
+
+def test_collections_disabled():
+    plan = plan_for(definition(Consumer, bases=list[Base]), collections=False)
+    assert plan.steps[0].missing == (list[Base],)
+
+
+def test_missing_dependency():
+    plan = plan_for(definition(Consumer, other=Other))
+    assert plan.steps[0].missing == (Other,)
+    assert plan.order == (0,)
+
+
+def test_cycles():
+    plan = plan_for(
+        definition(First, other=Other),
+        definition(Other, consumer=Consumer),
+        definition(Consumer, first=First),
+        definition(Second),
+        definition(Base, consumer=Consumer),
+    )
+    assert plan.cycles == ((First, Other, Consumer),)
+    assert plan.blocked == {0, 1, 2, 4}
+    assert plan.order == (3,)
+    assert plan.closure([3]) == (3,)
+    with pytest.raises(CycleDetectedError):
+        plan.check_cycles()
+    with pytest.raises(CycleDetectedError):
+        plan.closure([4])
+
+
+def test_plan_is_immutable():
+    plan = plan_for(definition(First))
+    with pytest.raises(dataclasses.FrozenInstanceError):
+        plan.order = ()  # pyright: ignore[reportAttributeAccessIssue]
+    with pytest.raises(TypeError):
+        plan.providers[Other] = ()  # pyright: ignore[reportIndexIssue]
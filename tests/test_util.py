@@ -1,8 +1,78 @@
+import gc
+import weakref
 from collections.abc import Awaitable, Coroutine
 
-from di.util import extract_satisfied_types_from_type
+from di.util import (
+    extract_injectable_parameters,
+    extract_satisfied_types_from_type,
+    interned_types,
+    keyword_parameters,
+    return_type,
+    type_hints,
+)
+
+
+class Config:
+    pass
+
+
+def make(*, config: "Config", name: str = "x") -> int:
+    return len(name) if config else 0
 
 
 def test_extract_satisfied_types_from_type_awaitable():
     assert int in extract_satisfied_types_from_type(Awaitable[int])
     assert int in extract_satisfied_types_from_type(Coroutine[None, None, int])
+
+
+def test_introspection_is_memoized():
+    assert type_hints(make)["config"] is Config
+    assert keyword_parameters(make) is keyword_parameters(make)
+    assert keyword_parameters(make) == {"config": Config, "name": str}
+    assert extract_injectable_parameters(make) == {"config": Config}
+    assert return_type(make) is int
+
+
+def test_unresolved_forward_reference_is_kept():
+    def unresolved(*, config: "Undefined") -> "Undefined":  # noqa: F821  # pyright: ignore[reportUndefinedVariable]
+        return config
+
+    assert keyword_parameters(unresolved) == {"config": "Undefined"}
+    assert return_type(unresolved) == "Undefined"
+
+
+def test_entries_are_dropped_with_the_callable():
+    def dynamic(*, config: Config) -> Config:
+        return config
+
+    assert keyword_parameters(dynamic) == {"config": Config}
+    collected = weakref.ref(dynamic)
+
+    del dynamic
+    gc.collect()
+
+    assert collected() is None
+
+
+def test_callables_without_weak_references_are_not_cached():
+    bound = Config().__init__
+    assert keyword_parameters(bound) == {}
+    assert keyword_parameters(object.__init__) == {}
+
+
+def test_type_sets_are_interned():
+    types = interned_types({Config, int})
+
+    assert types == frozenset({Config, int})
+    assert interned_types([int, Config]) is types
+    assert interned_types(types) is types
+
+
+def test_interned_sets_are_dropped_when_unused():
+    class Dynamic:
+        pass
+
+    collected = weakref.ref(interned_types({Dynamic}))
+    gc.collect()
+
+    assert collected() is None